@@ -0,0 +1,86 @@
+from __future__ import unicode_literals
+
+from django.db.migrations.operations.base import Operation
+
+
+class AddPartialIndex(Operation):
+    """Migration operation that adds an index that only includes the rows
+    matching a condition.  This keeps indexes small on tables where most
+    queries only look at a fraction of the rows, for example the live
+    (not deleted) rows of a safe deleted model.
+
+    Partial indexes are only created on backends that support them
+    (postgresql and sqlite).  On other backends this operation does nothing.
+
+    Example:
+
+    >> operations = [
+    ...     AddPartialIndex(model_name='mymodel',
+    ...                     name='mymodel_live_created_idx',
+    ...                     fields=['created_dttm'],
+    ...                     condition={'is_deleted': False})
+    ... ]
+
+    :param model_name: the name of the model to add the index for.
+    :param name: the name of the index.
+    :param fields: list of field names to index.
+    :param condition: dict of {field name: value} the rows must match to be
+        included in the index.
+    """
+    reduces_to_sql = True
+    reversible = True
+    supported_vendors = ('postgresql', 'sqlite')
+
+    def __init__(self, model_name, name, fields, condition):
+        self.model_name = model_name
+        self.name = name
+        self.fields = fields
+        self.condition = condition
+
+    def deconstruct(self):
+        return (self.__class__.__name__, [], {
+            'model_name': self.model_name,
+            'name': self.name,
+            'fields': self.fields,
+            'condition': self.condition,
+        })
+
+    def state_forwards(self, app_label, state):
+        # Django's migration state doesn't track partial indexes.
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor not in self.supported_vendors:
+            return
+
+        model = to_state.apps.get_model(app_label, self.model_name)
+        quote_name = schema_editor.quote_name
+        columns = [model._meta.get_field(field_name).column
+                   for field_name in self.fields]
+        conditions = [
+            '{0} = {1}'.format(
+                quote_name(model._meta.get_field(field_name).column),
+                schema_editor.quote_value(value)
+            )
+            for field_name, value in sorted(self.condition.items())
+        ]
+        schema_editor.execute('CREATE INDEX {0} ON {1} ({2}) WHERE {3}'.format(
+            quote_name(self.name),
+            quote_name(model._meta.db_table),
+            ', '.join(quote_name(column) for column in columns),
+            ' AND '.join(conditions)
+        ))
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor not in self.supported_vendors:
+            return
+
+        schema_editor.execute('DROP INDEX {0}'.format(
+            schema_editor.quote_name(self.name)
+        ))
+
+    def describe(self):
+        return 'Create partial index {0} on {1}'.format(self.name,
+                                                         self.model_name)
@@ -1,5 +1,8 @@
 from .managers import BaseManager
 from .managers import CommonManager
+from .managers import ReadOnlyManager
+from .managers import SafeDeleteAllManager
+from .managers import SafeDeleteManager
 from .managers import SlugManager
 from .managers import TokenManager
 from .managers import UserManager
@@ -0,0 +1,95 @@
+from __future__ import unicode_literals
+
+import threading
+from contextlib import contextmanager
+
+
+_local = threading.local()
+
+
+def is_identity_map_active():
+    """Boolean indicating if an identity map is active for the current
+    thread.
+    """
+    return getattr(_local, 'objects', None) is not None
+
+
+def activate_identity_map():
+    """Activates a new (empty) identity map for the current thread.  While
+    active, primary key lookups through the CommonManager hand back the
+    already loaded instance instead of querying the db again.
+    """
+    _local.objects = {}
+
+
+def deactivate_identity_map():
+    """Deactivates and clears the identity map for the current thread."""
+    _local.objects = None
+
+
+@contextmanager
+def identity_map():
+    """Context manager that activates an identity map for the duration of the
+    block.
+
+    Example:
+
+    >> with identity_map():
+    ...     obj = MyModel.objects.get_by_id(5)
+    ...     MyModel.objects.get_by_id(5) is obj  # no additional query
+    True
+
+    """
+    previous = getattr(_local, 'objects', None)
+    activate_identity_map()
+
+    try:
+        yield
+    finally:
+        _local.objects = previous
+
+
+def _get_key(model, pk):
+    # Rows are keyed by the concrete model so saving a proxy model instance
+    # also evicts any instances loaded through the concrete model and vice
+    # versa.
+    return (model._meta.concrete_model, pk)
+
+
+def get_identity(model, pk):
+    """Gets the instance of the model for the pk from the identity map or None
+    if the instance hasn't been loaded or no identity map is active.
+    """
+    objects = getattr(_local, 'objects', None)
+
+    if not objects:
+        return None
+
+    return objects.get(_get_key(model, pk), {}).get(model)
+
+
+def set_identity(instance):
+    """Adds an instance to the identity map if one is active."""
+    objects = getattr(_local, 'objects', None)
+
+    if objects is None or instance.pk is None:
+        return
+
+    model = instance.__class__
+    objects.setdefault(_get_key(model, instance.pk), {})[model] = instance
+
+
+def evict_identity(instance):
+    """Removes an instance from the identity map.  This is called when an
+    instance is saved or deleted so the next lookup gets the db state.
+    """
+    if instance.pk is not None:
+        evict_identity_pk(model=instance.__class__, pk=instance.pk)
+
+
+def evict_identity_pk(model, pk):
+    """Removes the instance of the model for the pk from the identity map."""
+    objects = getattr(_local, 'objects', None)
+
+    if objects:
+        objects.pop(_get_key(model, pk), None)
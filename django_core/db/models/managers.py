@@ -1,17 +1,71 @@
 from __future__ import unicode_literals
 
 import math
+import time
+from collections import OrderedDict
+from collections import namedtuple
+from datetime import datetime
 
+from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+from django.db import IntegrityError
+from django.db import connections
 from django.db import models
+from django.db import router
+from django.db import transaction
+from django.db.models import Case
+from django.db.models import Q
+from django.db.models import Value
+from django.db.models import When
+from django.db.models.deletion import Collector
+from django.db.models.signals import class_prepared
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
 from django.http.response import Http404
 from django.template.defaultfilters import slugify
-from django_core.utils.random_utils import random_alphanum
+from django_core.db.models.identity import evict_identity
+from django_core.db.models.identity import evict_identity_pk
+from django_core.db.models.identity import get_identity
+from django_core.db.models.identity import is_identity_map_active
+from django_core.db.models.identity import set_identity
+from django_core.db.models.paging import get_keyset_page
+from django_core.db.pinning import pin_to_primary
+from django_core.db.pinning import use_primary
+from django_core.utils.cache_utils import LocalTTLCache
+from django_core.utils.list_utils import iter_chunks
+from django_core.utils.random_utils import random_alphanums
+
+
+# Cache version for objects that have been deleted.  This prevents a read that
+# was in flight while the object was deleted from caching the deleted object.
+_CACHE_DELETED = 'deleted'
+
+# namedtuple classes for get_or_none(values=True, named=True) rows keyed by
+# (model, field names) so the class is only built once per set of fields.
+_ROW_CLASSES = {}
+
+# Process local caches for ReadOnlyManager lookups keyed by model.
+_LOCAL_CACHES = {}
 
 
 class BaseManager(models.Manager):
 
+    @property
+    def db_for_write(self):
+        """The db alias writes through this manager go to.  This is the
+        write counterpart of the manager's "db" property.
+        """
+        return self._db or router.db_for_write(self.model, **self._hints)
+
+    def primary(self):
+        """Gets a queryset that reads from the db writes go to (the primary
+        db) instead of a read replica.
+        """
+        return self.using(self.db_for_write)
+
     def get_or_none(self, prefetch_related=None, select_related=False,
+                    only=None, defer=None, values=False, named=False,
                     **kwargs):
         """Gets a single object based on kwargs or None if one is not found.
 
@@ -41,9 +95,50 @@ class BaseManager(models.Manager):
             ...                            'some_field__some_fields_field'])
 
             See: https://docs.djangoproject.com/en/dev/ref/models/querysets/
+        :param only: list or tuple of field names to load.  All other fields
+            are deferred and loaded from the db when first accessed.
+        :param defer: list or tuple of field names to not load until they're
+            first accessed.  This is useful for wide rows with large text
+            fields that aren't needed.
+        :param values: boolean when set to True returns the row as a dict of
+            field names and their values instead of building a model
+            instance.  The fields are the "only" fields if provided, otherwise
+            all concrete fields except the "defer" fields.
+
+            Example:
+
+            >> get_or_none(values=True, only=['id', 'slug'], id=5)
+            {'id': 5, 'slug': 'some-slug'}
+
+        :param named: boolean when set to True along with "values" returns the
+            row as a namedtuple instead of a dict.
         :param kwargs: list of fields and their values to retrieve.
 
+        If an identity map is active for the current thread (see
+        django_core.db.models.identity), objects found are added to it and
+        lookups by primary key return the already loaded instance without
+        making another db query.  Partial objects and rows (only, defer or
+        values) are never read from or added to the identity map.
         """
+        if values:
+            return self._get_row_or_none(only=only,
+                                         defer=defer,
+                                         named=named,
+                                         **kwargs)
+
+        use_identity_map = (is_identity_map_active() and
+                            not only and not defer and
+                            not self.get_queryset().query.where)
+
+        if use_identity_map:
+            pk = self._get_pk_lookup_value(kwargs)
+
+            if pk is not None:
+                obj = get_identity(model=self.model, pk=pk)
+
+                if obj is not None:
+                    return obj
+
         try:
             if prefetch_related:
                 query_set = self.prefetch_related(*prefetch_related)
@@ -52,20 +147,122 @@ class BaseManager(models.Manager):
             elif isinstance(select_related, (list, tuple)):
                 query_set = self.select_related(*select_related)
             else:
-                query_set = self
+                query_set = self.get_queryset()
+
+            if only:
+                query_set = query_set.only(*only)
 
-            return query_set.get(**kwargs)
+            if defer:
+                query_set = query_set.defer(*defer)
+
+            obj = query_set.get(**kwargs)
+        except self.model.DoesNotExist:
+            return None
+
+        if use_identity_map:
+            set_identity(obj)
+
+        return obj
+
+    def _get_row_or_none(self, only=None, defer=None, named=False, **kwargs):
+        """Gets a single row as a dict (or namedtuple if named is True) or
+        None if one is not found.  See get_or_none(values=True, ...).
+        """
+        if only:
+            field_names = list(only)
+        else:
+            defer = set(defer or [])
+            field_names = [field.attname
+                           for field in self.model._meta.concrete_fields
+                           if field.name not in defer and
+                           field.attname not in defer]
+
+        try:
+            if named:
+                row = self.values_list(*field_names).get(**kwargs)
+            else:
+                return self.values(*field_names).get(**kwargs)
         except self.model.DoesNotExist:
             return None
 
+        row_class_key = (self.model, tuple(field_names))
+        row_class = _ROW_CLASSES.get(row_class_key)
+
+        if row_class is None:
+            row_class = namedtuple(str('{0}Row'.format(self.model.__name__)),
+                                   [str(name) for name in field_names],
+                                   rename=True)
+            _ROW_CLASSES[row_class_key] = row_class
+
+        return row_class(*row)
+
+    def _get_pk_lookup_value(self, lookup_kwargs):
+        """Gets the primary key value if the lookup kwargs are only a lookup by
+        primary key.  Otherwise, return None.
+        """
+        if len(lookup_kwargs) != 1:
+            return None
+
+        key, value = list(lookup_kwargs.items())[0]
+        pk_field = self.model._meta.pk
+
+        if key not in ('pk', 'pk__exact', pk_field.name,
+                       '{0}__exact'.format(pk_field.name)):
+            return None
+
+        try:
+            return pk_field.to_python(value)
+        except Exception:
+            # Let the db lookup handle (and error on) bad values
+            return None
+
 
 class CommonManager(BaseManager):
+    """Common model manager.
+
+    Primary key lookups (get_by_id, get_by_id_or_404, get_by_ids_cached and
+    get_by_ids_map) can be served from the django cache framework by setting
+    cache_lookups to True on a manager subclass:
+
+    class MyManager(CommonManager):
+        cache_lookups = True
+        cache_timeout = 60 * 10
+
+    Cached objects are versioned by their last_modified_dttm.  The cached
+    version is updated by the model's post_save and post_delete hooks (see
+    AbstractBaseModel) which are automatically connected for models whose
+    default manager has cache_lookups enabled.  QuerySet.update(...) and
+    QuerySet.delete() don't send these signals so they won't update the
+    cache.
+    """
+    # The max number of ids to put in a single "IN (...)" clause.  This keeps
+    # large id lists under the bound parameter limits of the db backends
+    # (sqlite for example only allows 999 parameters per query).
+    id_chunk_size = 500
+    # boolean indicating if primary key lookups should be cached
+    cache_lookups = False
+    # the django cache alias to use for the cached lookups
+    cache_alias = 'default'
+    # number of seconds a cached object is valid for
+    cache_timeout = 300
 
     def get_by_id(self, id, **kwargs):
         """Gets a document by an id.
 
         :param id: id of the document to retrieve.
         """
+        if self._use_lookup_cache(kwargs):
+            id = self.model._meta.pk.to_python(id)
+            obj = get_identity(model=self.model, pk=id)
+
+            if obj is None:
+                obj = self.get_by_ids_map(ids=[id]).get(id)
+
+                if obj is not None:
+                    set_identity(obj)
+
+            return obj
+
         return self.get_or_none(id=id, **kwargs)
 
     def get_by_id_or_404(self, id, **kwargs):
@@ -86,6 +283,200 @@ class CommonManager(BaseManager):
         """
         return self.filter(id__in=ids)
 
+    def get_by_ids_cached(self, ids, **kwargs):
+        """Gets objects by ids and returns them as a list in the same order as
+        the ids.  When cache_lookups is enabled, cached objects are served
+        from the cache and only the missing objects are queried.  Ids that
+        weren't found are skipped.
+
+        :param ids: iterable of ids of objects to return.
+        :param kwargs: additional filter criteria.
+        """
+        return self.get_by_ids_ordered(ids=ids, **kwargs)
+
+    def get_by_ids_map(self, ids, chunk_size=None, **kwargs):
+        """Gets objects by ids and returns a dict of {id: obj}.  Large id lists
+        are split into multiple "IN" queries of at most chunk_size ids so the
+        lookup is safe for any number of ids.  Ids that weren't found won't be
+        in the returned dict.
+
+        :param ids: iterable of ids of objects to return.
+        :param chunk_size: the max number of ids per query.  Defaults to
+            self.id_chunk_size.
+        :param kwargs: additional filter criteria.
+        """
+        id_map = {}
+        use_cache = self._use_lookup_cache(kwargs)
+
+        for chunk in iter_chunks(self._clean_ids(ids),
+                                 chunk_size or self.id_chunk_size):
+            if use_cache:
+                cached = self.cache_get_many(ids=chunk)
+                id_map.update(cached)
+                chunk = [id for id in chunk if id not in cached]
+
+                if not chunk:
+                    continue
+
+            for obj in self.filter(id__in=chunk, **kwargs):
+                id_map[obj.id] = obj
+
+                if use_cache:
+                    self.cache_add(obj)
+
+        return id_map
+
+    def get_by_ids_ordered(self, ids, chunk_size=None, **kwargs):
+        """Gets objects by ids and returns them as a list in the same order as
+        the ids provided.  Ids that weren't found are skipped.
+
+        :param ids: iterable of ids of objects to return.
+        :param chunk_size: the max number of ids per query.  Defaults to
+            self.id_chunk_size.
+        :param kwargs: additional filter criteria.
+        """
+        ids = self._clean_ids(ids)
+        id_map = self.get_by_ids_map(ids=ids, chunk_size=chunk_size, **kwargs)
+        return [id_map[id] for id in ids if id in id_map]
+
+    def ids_existing(self, ids, chunk_size=None, **kwargs):
+        """Gets the set of ids that exist in the db.  This only pulls the id
+        column so no model instances are built.
+
+        :param ids: iterable of ids to check.
+        :param chunk_size: the max number of ids per query.  Defaults to
+            self.id_chunk_size.
+        :param kwargs: additional filter criteria.
+        """
+        existing = set()
+
+        for chunk in iter_chunks(self._clean_ids(ids),
+                                 chunk_size or self.id_chunk_size):
+            existing.update(self.filter(id__in=chunk, **kwargs).values_list(
+                'id', flat=True
+            ))
+
+        return existing
+
+    def ids_missing(self, ids, chunk_size=None, **kwargs):
+        """Gets the set of ids that don't exist in the db.
+
+        :param ids: iterable of ids to check.
+        :param chunk_size: the max number of ids per query.  Defaults to
+            self.id_chunk_size.
+        :param kwargs: additional filter criteria.
+        """
+        ids = self._clean_ids(ids)
+        return set(ids).difference(self.ids_existing(ids=ids,
+                                                     chunk_size=chunk_size,
+                                                     **kwargs))
+
+    def _use_lookup_cache(self, lookup_kwargs):
+        """Boolean indicating if the lookup can be served from the cache."""
+        return (self.cache_lookups and not lookup_kwargs and
+                not self.get_queryset().query.where)
+
+    def get_cache_key(self, id):
+        """Gets the cache key that points to the current version of the cached
+        object for an id.
+        """
+        meta = self.model._meta.concrete_model._meta
+        return 'django_core:{0}.{1}:{2}'.format(meta.app_label,
+                                                meta.model_name,
+                                                id)
+
+    def get_cache_version(self, obj):
+        """Gets the version of an object that's used for the cache key of the
+        cached object.
+        """
+        last_modified_dttm = getattr(obj, 'last_modified_dttm', None)
+
+        if not last_modified_dttm:
+            return '0'
+
+        return last_modified_dttm.strftime('%Y%m%d%H%M%S%f')
+
+    def _get_versioned_cache_key(self, id, version):
+        return '{0}:{1}'.format(self.get_cache_key(id), version)
+
+    def cache_get_many(self, ids):
+        """Gets the cached objects for the ids.
+
+        :param ids: list of ids to get the cached objects for.
+        :return: dict of {id: obj} for the ids that were found in the cache.
+        """
+        cache = caches[self.cache_alias]
+        versions = cache.get_many([self.get_cache_key(id) for id in ids])
+
+        if not versions:
+            return {}
+
+        keys = {}
+
+        for id in ids:
+            version = versions.get(self.get_cache_key(id))
+
+            if version and version != _CACHE_DELETED:
+                keys[self._get_versioned_cache_key(id, version)] = id
+
+        cached = cache.get_many(list(keys.keys()))
+        return dict((keys[key], obj) for key, obj in cached.items())
+
+    def cache_add(self, obj):
+        """Adds an object loaded from the db to the cache.  If a different
+        version of the object is already being pointed to (because it was
+        saved or deleted while this object was being loaded) that version is
+        kept.
+        """
+        cache = caches[self.cache_alias]
+        version = self.get_cache_version(obj)
+        cache.set(self._get_versioned_cache_key(obj.id, version),
+                  obj,
+                  self.cache_timeout)
+        cache.add(self.get_cache_key(obj.id), version, self.cache_timeout)
+
+    def cache_set_version(self, obj, deleted=False):
+        """Points the cache at the current version of an object.  This is
+        called after an object is saved or deleted so stale versions of the
+        object are no longer served from the cache.
+
+        :param obj: the object that was saved or deleted.
+        :param deleted: boolean indicating if the object was deleted.
+        """
+        if deleted:
+            return self.cache_set_deleted(ids=[obj.id])
+
+        caches[self.cache_alias].set(self.get_cache_key(obj.id),
+                                     self.get_cache_version(obj),
+                                     self.cache_timeout)
+
+    def cache_set_deleted(self, ids):
+        """Marks the ids of deleted objects as deleted in the cache so the
+        objects are no longer served from the cache.
+        """
+        caches[self.cache_alias].set_many(
+            dict((self.get_cache_key(id), _CACHE_DELETED) for id in ids),
+            self.cache_timeout
+        )
+
+    def _clean_ids(self, ids):
+        """Converts ids to the python type of the primary key (so "5" and 5 are
+        treated as the same id) and removes duplicates while keeping the
+        original order.
+        """
+        to_python = self.model._meta.pk.to_python
+        seen = set()
+        cleaned = []
+
+        for id in ids:
+            id = to_python(id)
+
+            if id not in seen:
+                seen.add(id)
+                cleaned.append(id)
+
+        return cleaned
+
     def bulk_create(self, objs, *args, **kwargs):
         """Insert many object at once."""
         if hasattr(self.model, 'save_prep'):
@@ -93,30 +484,399 @@ class CommonManager(BaseManager):
             # subclass AbstractBaseModel, then don't call this.
             self.model.save_prep(instance_or_instances=objs)
 
-        return super(CommonManager, self).bulk_create(objs=objs,
+        objs = super(CommonManager, self).bulk_create(objs=objs,
                                                       *args,
                                                       **kwargs)
+        pin_to_primary()
+        return objs
+
+    def page_after(self, cursor=None, size=15, ordering=None, **kwargs):
+        """Gets a page of objects using keyset (seek) pagination so deep pages
+        cost the same as the first page.  See
+        django_core.db.models.paging.get_keyset_page.
+
+        :param cursor: the next_cursor or previous_cursor from a previous
+            page.  If None, the first page is returned.
+        :param size: the number of objects per page.
+        :param ordering: list of field names to order by.  Defaults to the
+            model's default ordering.
+        :param kwargs: additional filter criteria.
+        :return: KeysetPage with the object_list, next_cursor and
+            previous_cursor.
+        """
+        return get_keyset_page(query_set=self.filter(**kwargs),
+                               cursor=cursor,
+                               size=size,
+                               ordering=ordering)
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """Updates fields on many saved objects using a small number of UPDATE
+        statements.  Each statement updates up to batch_size objects with a
+        "CASE WHEN id = ... THEN ..." expression per field.
+
+        The objects are prepped (see AbstractBaseModel.save_prep) before being
+        updated and if the model has a last_modified_dttm field it's always
+        updated.  Like QuerySet.update(...), no save signals are sent.
+
+        :param objs: list of saved objects to update.
+        :param fields: list of field names to update.
+        :param batch_size: the max number of objects to update per statement.
+        :return: the number of rows updated.
+        """
+        objs = list(objs)
+
+        if not objs:
+            return 0
+
+        if any(obj.pk is None for obj in objs):
+            raise ValueError('All objects must be saved before they can be '
+                             'bulk updated.')
+
+        if hasattr(self.model, 'save_prep'):
+            self.model.save_prep(instance_or_instances=objs)
+
+        meta = self.model._meta
+        fields = [meta.get_field(field_name) for field_name in fields]
+        field_names = [field.name for field in fields]
+
+        if ('last_modified_dttm' not in field_names and
+                'last_modified_dttm' in [f.name for f in meta.concrete_fields]):
+            fields.append(meta.get_field('last_modified_dttm'))
+
+        # each object binds its pk and a value per field in the CASE
+        # expressions plus its pk in the "id IN (...)" filter so the backend
+        # is asked how many objects fit with that many params per object.
+        max_batch_size = connections[self.db_for_write].ops.bulk_batch_size(
+            ['pk'] * (2 * len(fields) + 1),
+            objs
+        )
+        batch_size = min(batch_size or self.id_chunk_size,
+                         max(1, max_batch_size))
+        rows = 0
+
+        with transaction.atomic(using=self.db_for_write, savepoint=False):
+            for batch in iter_chunks(objs, batch_size):
+                update_kwargs = {}
+
+                for field in fields:
+                    when_statements = [
+                        When(pk=obj.pk, then=Value(getattr(obj, field.attname),
+                                                   output_field=field))
+                        for obj in batch
+                    ]
+                    update_kwargs[field.attname] = Case(*when_statements,
+                                                        output_field=field)
+
+                rows += self.filter(pk__in=[obj.pk for obj in batch]).update(
+                    **update_kwargs
+                )
+
+        self._objects_changed(objs)
+        return rows
+
+    def bulk_upsert(self, objs, unique_fields, update_fields, batch_size=None):
+        """Inserts or updates many objects.  Objects are matched to existing
+        rows by the unique fields (with a query per chunk of objects).  Matched
+        rows get the update fields updated (see bulk_update) and the rest of
+        the objects are inserted with bulk_create.  Objects with a None
+        unique value are never matched and always inserted.  Matched objects
+        get the pk and created_dttm of their existing rows.
+
+        :param objs: list of unsaved objects.
+        :param unique_fields: list of field names that uniquely identify a row.
+        :param update_fields: list of field names to update for objects that
+            already exist.
+        :param batch_size: the max number of objects per statement.
+        :return: tuple of (created objects, updated objects)
+        """
+        objs = list(objs)
+
+        if not objs:
+            return [], []
+
+        if hasattr(self.model, 'save_prep'):
+            # prep first since stripping fields can change the unique values
+            self.model.save_prep(instance_or_instances=objs)
+
+        meta = self.model._meta
+        unique_fields = [meta.get_field(field_name)
+                         for field_name in unique_fields]
+        attnames = [field.attname for field in unique_fields]
+
+        def get_key(values):
+            return tuple(field.to_python(value)
+                         for field, value in zip(unique_fields, values))
+
+        # a None unique value would be matched with "IS NULL" and NULLs are
+        # never equal in unique constraints, so those objects are always
+        # inserted.
+        matchable_objs = [obj for obj in objs
+                          if all(getattr(obj, attname) is not None
+                                 for attname in attnames)]
+        # the created_dttm of matched rows is reloaded so the objects don't
+        # keep the created_dttm they were prepped with as new objects.
+        has_created_dttm = 'created_dttm' in [f.name for f in
+                                              meta.concrete_fields]
+        row_attnames = ['pk'] + (['created_dttm'] if has_created_dttm else [])
+        existing = {}
+        chunk_size = max(self.id_chunk_size // len(unique_fields), 1)
+
+        for chunk in iter_chunks(matchable_objs, chunk_size):
+            query = Q()
+
+            for obj in chunk:
+                query |= Q(**dict((attname, getattr(obj, attname))
+                                  for attname in attnames))
+
+            for row in self.primary().filter(query).values_list(
+                    *(row_attnames + attnames)):
+                existing[get_key(row[len(row_attnames):])] = row
+
+        to_create = []
+        to_update = []
+
+        for obj in objs:
+            values = [getattr(obj, attname) for attname in attnames]
+            row = None
+
+            if all(value is not None for value in values):
+                row = existing.get(get_key(values))
+
+            if row is None:
+                to_create.append(obj)
+            else:
+                obj.pk = row[0]
+
+                if has_created_dttm:
+                    obj.created_dttm = row[1]
+
+                obj._state.adding = False
+                obj._state.db = self.db_for_write
+                to_update.append(obj)
+
+        with transaction.atomic(using=self.db_for_write):
+            if to_update:
+                self.bulk_update(to_update, update_fields,
+                                 batch_size=batch_size)
+
+            if to_create:
+                self.bulk_create(to_create, batch_size=batch_size)
+
+        return to_create, to_update
+
+    def _objects_changed(self, objs):
+        """Clears the identity map and updates the cached versions for objects
+        that were changed in the db without going through save().
+        """
+        pin_to_primary()
+
+        for obj in objs:
+            evict_identity(obj)
+
+            if self.cache_lookups:
+                self.cache_set_version(obj=obj)
+
+    def _ids_deleted(self, ids):
+        """Clears the identity map and the cache for ids of objects that were
+        deleted from the db without going through delete().
+        """
+        pin_to_primary()
+
+        for id in ids:
+            evict_identity_pk(model=self.model, pk=id)
+
+        if self.cache_lookups:
+            self.cache_set_deleted(ids=ids)
+
+    def bulk_create_iter(self, objs, batch_size=500, atomic=False):
+        """Insert objects from any iterable (including generators) in chunks of
+        batch_size.  Each chunk is prepped and inserted before the next chunk
+        is read so memory use stays flat regardless of how many objects are
+        inserted.  The inserted objects aren't kept or returned.
+
+        :param objs: iterable of unsaved objects to insert.
+        :param batch_size: the number of objects to prep and insert at a time.
+        :param atomic: boolean indicating if each chunk should be inserted in
+            its own transaction.
+        :return: the number of objects inserted.
+        """
+        count = 0
+
+        for chunk in iter_chunks(objs, batch_size):
+            if atomic:
+                with transaction.atomic(using=self.db_for_write):
+                    self.bulk_create(chunk, batch_size=batch_size)
+            else:
+                self.bulk_create(chunk, batch_size=batch_size)
+
+            count += len(chunk)
+
+        return count
 
     def delete_by_id(self, id):
         """Deletes a document by id."""
         return self.delete_by_ids(ids=[id])
 
     def delete_by_ids(self, ids):
-        """Delete objects by ids.
+        """Delete objects by ids.  Large id lists are deleted in chunks (see
+        bulk_delete_by_ids) and each chunk is committed separately.
 
         :param ids: list of objects ids to delete.
         :return: True if objects were deleted.  Otherwise, return False if no
                 objects were found or the delete was not successful.
         """
         try:
-            self.filter(id__in=ids).delete()
+            self.bulk_delete_by_ids(ids=ids)
             return True
         except self.model.DoesNotExist:
             return False
 
+    def bulk_delete_by_ids(self, ids, chunk_size=None):
+        """Deletes objects by ids in chunks of chunk_size ids.  Each chunk is
+        deleted in its own transaction so locks are only held for the length
+        of a chunk.
+
+        When the model has no delete signal receivers, no cascading relations
+        and no parent models, each chunk is deleted with a single DELETE
+        statement without loading the objects.  Otherwise, the chunk is
+        deleted through django's deletion collector so cascades and signals
+        are handled.
+
+        :param ids: iterable of ids of objects to delete.
+        :param chunk_size: the max number of ids to delete per chunk.  Defaults
+            to self.id_chunk_size.
+        :return: list of the number of rows deleted for each chunk.
+        """
+        using = self.db_for_write
+        collector = Collector(using=using)
+        counts = []
+
+        for chunk in iter_chunks(self._clean_ids(ids),
+                                 chunk_size or self.id_chunk_size):
+            query_set = self.using(using).filter(id__in=chunk)
+
+            with transaction.atomic(using=using):
+                if collector.can_fast_delete(query_set):
+                    count = query_set._raw_delete(using=using)
+                else:
+                    # django < 1.9 doesn't return the number of rows deleted
+                    count = (query_set.delete() or (None,))[0]
+
+            self._ids_deleted(ids=chunk)
+            counts.append(count)
+
+        return counts
+
+    def delete_in_batches(self, batch_size=None, sleep=0, progress=None,
+                          archive=None, **kwargs):
+        """Deletes all objects matching the filter criteria in batches of at
+        most batch_size objects.  Each batch is selected for update and
+        deleted in its own transaction (see bulk_delete_by_ids) so a large
+        delete never holds locks for long and can run alongside regular
+        traffic.
+
+        :param batch_size: the max number of objects to delete per batch.
+            Defaults to self.id_chunk_size.
+        :param sleep: the number of seconds to sleep between batches to
+            throttle the load on the db.
+        :param progress: optional callable that's called after each batch with
+            the total number of objects deleted so far.
+        :param archive: optional callable that's called with the list of
+            objects in each batch before they're deleted (i.e. to copy them to
+            an archive table).  The archive call and the delete happen in the
+            same transaction.  If not provided, only the ids of the objects
+            are fetched.
+        :param kwargs: the filter criteria for the objects to delete.
+        :return: the total number of objects deleted.
+        """
+        using = self.db_for_write
+        batch_size = batch_size or self.id_chunk_size
+        # the batch is locked until it's deleted so rows that are changed to
+        # no longer match the filter criteria in the meantime aren't deleted.
+        query_set = self.using(using).filter(**kwargs).order_by('id')
+        query_set = query_set.select_for_update()
+        total = 0
+
+        while True:
+            with transaction.atomic(using=using):
+                if archive:
+                    objs = list(query_set[:batch_size])
+                    ids = [obj.id for obj in objs]
+                else:
+                    ids = list(query_set.values_list('id',
+                                                     flat=True)[:batch_size])
+
+                if not ids:
+                    break
+
+                if archive:
+                    archive(objs)
+
+                count = self.bulk_delete_by_ids(ids=ids,
+                                                chunk_size=batch_size)[0]
+
+            total += len(ids) if count is None else count
+
+            if progress:
+                progress(total)
+
+            if len(ids) < batch_size:
+                break
+
+            if sleep:
+                time.sleep(sleep)
+
+        return total
+
+
+class ReadOnlyManager(CommonManager):
+    """Manager for read only models (see ReadOnlyModelMixin).  Since the
+    objects are never saved through the ORM, primary key lookups are cached in
+    a process local cache (see LocalTTLCache) for cache_timeout seconds.  This
+    avoids the network round trip and unpickling of a shared cache.
+
+    Cached objects are shared by all callers in the process and must not be
+    changed.
+    """
+    cache_lookups = True
+    cache_timeout = 60 * 60
+    # the max number of objects to cache per model
+    local_cache_max_size = 10000
+
+    def get_local_cache(self):
+        """Gets the process local cache for the model."""
+        cache = _LOCAL_CACHES.get(self.model)
+
+        if cache is None:
+            cache = _LOCAL_CACHES.setdefault(
+                self.model,
+                LocalTTLCache(timeout=self.cache_timeout,
+                              max_size=self.local_cache_max_size)
+            )
+
+        return cache
+
+    def cache_get_many(self, ids):
+        return self.get_local_cache().get_many(ids)
+
+    def cache_add(self, obj):
+        self.get_local_cache().set(obj.id, obj)
+
+    def cache_set_version(self, obj, deleted=False):
+        self.get_local_cache().delete_many([obj.id])
+
+    def cache_set_deleted(self, ids):
+        self.get_local_cache().delete_many(ids)
+
+    def cache_clear(self):
+        """Clears the process local cache for the model."""
+        self.get_local_cache().clear()
+
 
 class SlugManager(BaseManager):
     """Manager mixin for slugs."""
+    # The max number of distinct slugs to check for in a single query.
+    slug_chunk_size = 200
 
     def get_by_slug(self, slug, **kwargs):
         try:
@@ -155,18 +915,157 @@ class SlugManager(BaseManager):
         to the end of the slug until the next available slug is found.
 
         """
-        original_slug = slug = slugify(slug)
+        slug = slugify(slug)
+        return self._get_next_available_slug(
+            slug=slug,
+            taken_slugs=self._get_taken_slugs(slugs=[slug], **kwargs)
+        )
+
+    def get_next_slugs(self, values, **kwargs):
+        """Gets the next available slug for each value.  Slugs are unique
+        against the db and against each other, so the returned slugs can be
+        used for a bulk_create.  The db is checked with a single query per
+        slug_chunk_size distinct slugs.
+
+        :param values: list of values to slugify.
+        :param kwargs: additional filter criteria to check for when looking for
+            unique slugs.
+        :return: list of slugs in the same order as the values.
+
+        Example:
+
+        If "my-slug" is already taken:
+
+        >> get_next_slugs(['My Slug', 'my slug', 'other'])
+        ['my-slug-1', 'my-slug-2', 'other']
+
+        """
+        slugs = [slugify(value) for value in values]
+        taken_slugs = set()
+
+        for chunk in iter_chunks(set(slugs), self.slug_chunk_size):
+            taken_slugs.update(self._get_taken_slugs(slugs=chunk, **kwargs))
+
+        next_slugs = []
+
+        for slug in slugs:
+            next_slug = self._get_next_available_slug(slug=slug,
+                                                      taken_slugs=taken_slugs)
+            taken_slugs.add(next_slug)
+            next_slugs.append(next_slug)
+
+        return next_slugs
+
+    def create_with_next_slug(self, slug, slug_filters=None, max_attempts=5,
+                              **kwargs):
+        """Creates an object using the next available slug.  If a concurrent
+        insert takes the slug first (the slug field has a unique constraint)
+        the next available slug is looked up again and the create is retried.
+
+        :param slug: the value to slugify.
+        :param slug_filters: dict of additional filter criteria to check for
+            when looking for a unique slug.
+        :param max_attempts: the max number of times to try creating the
+            object before the IntegrityError is raised.
+        :param kwargs: the fields to create the object with.
+        """
+        for attempt in range(1, max_attempts + 1):
+            kwargs['slug'] = self.get_next_slug(slug, **(slug_filters or {}))
+
+            try:
+                with transaction.atomic(using=self.db_for_write):
+                    return self.create(**kwargs)
+            except IntegrityError:
+                if attempt >= max_attempts:
+                    raise
+
+    def _get_taken_slugs(self, slugs, **kwargs):
+        """Gets the set of slugs that are already being used that are either
+        one of the slugs or one of the slugs with a "-n" suffix.  This is done
+        in a single query.
+        """
+        query = Q()
+
+        for slug in set(slugs):
+            query |= Q(slug=slug) | Q(slug__startswith='{0}-'.format(slug))
+
+        # read from the primary db since the slugs are about to be written
+        return set(self.primary().filter(query, **kwargs).values_list(
+            'slug', flat=True
+        ))
+
+    def _get_next_available_slug(self, slug, taken_slugs):
+        """Gets the first "slug" or "slug-n" value that's not in the set of
+        taken slugs.
+        """
+        next_slug = slug
         count = 0
 
-        while not self.is_slug_available(slug=slug, **kwargs):
+        while next_slug in taken_slugs:
             count += 1
-            slug = '{0}-{1}'.format(original_slug, count)
+            next_slug = '{0}-{1}'.format(slug, count)
 
-        return slug
+        return next_slug
 
 
 class TokenManager(BaseManager):
     """Manager Mixin for tokens."""
+    # The max number of tokens to check for in a single query.
+    token_chunk_size = 500
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert many object at once.
+
+        If the model doesn't precheck tokens (see AbstractTokenModel), the
+        tokens are generated without a db lookup and the insert is retried,
+        regenerating only the tokens that collided, if the unique constraint
+        on the token column fails.
+        """
+        if getattr(self.model, 'precheck_tokens', True):
+            return super(TokenManager, self).bulk_create(objs, *args, **kwargs)
+
+        objs = list(objs)
+        tokenless = [obj for obj in objs if not obj.token]
+        max_attempts = self.model.token_max_attempts
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                with transaction.atomic(using=self.db_for_write):
+                    return super(TokenManager, self).bulk_create(objs,
+                                                                 *args,
+                                                                 **kwargs)
+            except IntegrityError:
+                collided = self._get_collided_token_objs(tokenless)
+
+                if attempt >= max_attempts or not collided:
+                    # either the error wasn't caused by the tokens or there
+                    # have been too many attempts
+                    raise
+
+                for obj in collided:
+                    obj.token = self.model.generate_token()
+
+    def _get_collided_token_objs(self, objs):
+        """Gets the objects whose token is already in the db or is duplicated
+        by an earlier object in objs.
+        """
+        tokens = [obj.token for obj in objs]
+        taken = set()
+
+        for chunk in iter_chunks(set(tokens), self.token_chunk_size):
+            taken.update(self.primary().filter(
+                token__in=chunk
+            ).values_list('token', flat=True))
+
+        collided = []
+
+        for obj in objs:
+            if obj.token in taken:
+                collided.append(obj)
+            else:
+                taken.add(obj.token)
+
+        return collided
 
     def get_by_token(self, token, **kwargs):
         """Get by token."""
@@ -212,10 +1111,11 @@ class TokenManager(BaseManager):
         available = set([])
 
         while True:
-            tokens = [random_alphanum(length=token_length)
-                      for t in range(count + token_buffer)]
-            db_tokens = self.filter(token__in=tokens).values_list('token',
-                                                                  flat=True)
+            tokens = random_alphanums(count=count + token_buffer,
+                                      length=token_length)
+            db_tokens = self.primary().filter(
+                token__in=tokens
+            ).values_list('token', flat=True)
             available.update(set(tokens).difference(db_tokens))
 
             if len(available) >= count:
@@ -235,9 +1135,155 @@ class UserManager(models.Manager):
             return []
 
 
-class GenericManager(models.Manager):
+class GenericQuerySet(models.QuerySet):
+    """QuerySet for models that have generic objects."""
+    _content_objects_select_related = None
+    _content_objects_done = False
+
+    def with_content_objects(self, select_related=None):
+        """Resolves the content objects of all the generic foreign keys for
+        the objects in the queryset with a query per content type instead of
+        a query per object.  Content objects that no longer exist are set to
+        None.
+
+        :param select_related: the fields to select related on the content
+            objects.  This can be a list of fields which is used for every
+            content type or a dict of {model: [fields]} to select related
+            fields per content type model.
+
+            Example:
+
+            >> MyModel.objects.with_content_objects(select_related={
+            ...     Comment: ['created_user']
+            ... })
+
+        """
+        clone = self._clone()
+        clone._content_objects_select_related = select_related or ()
+        return clone
+
+    def _clone(self, **kwargs):
+        clone = super(GenericQuerySet, self)._clone(**kwargs)
+        clone._content_objects_select_related = (
+            self._content_objects_select_related
+        )
+        return clone
+
+    def _fetch_all(self):
+        super(GenericQuerySet, self)._fetch_all()
+
+        if (self._content_objects_select_related is not None and
+                not self._content_objects_done):
+            self._content_objects_done = True
+            set_content_objects(
+                objs=[obj for obj in self._result_cache
+                      if isinstance(obj, self.model)],
+                select_related=self._content_objects_select_related
+            )
+
+
+def set_content_objects(objs, select_related=None, chunk_size=500):
+    """Sets the content objects of all the generic foreign keys on the objects
+    with a query per content type.
+
+    :param objs: list of model instances of the same model.
+    :param select_related: the fields to select related on the content
+        objects (see GenericQuerySet.with_content_objects).
+    :param chunk_size: the max number of content object ids to get per query.
+    """
+    if not objs:
+        return
+
+    meta = objs[0]._meta
+    fields = [field
+              for field in getattr(meta, 'private_fields', None) or
+              getattr(meta, 'virtual_fields', [])
+              if isinstance(field, GenericForeignKey)]
+    using = objs[0]._state.db
+
+    for field in fields:
+        ct_attname = meta.get_field(field.ct_field).get_attname()
+        ids_by_content_type = OrderedDict()
+
+        for obj in objs:
+            content_type_id = getattr(obj, ct_attname)
+            object_id = getattr(obj, field.fk_field)
+
+            if content_type_id is not None and object_id is not None:
+                ids_by_content_type.setdefault(content_type_id, set()).add(
+                    object_id
+                )
+
+        content_objects = {}
+        models_by_content_type = {}
+
+        for content_type_id, ids in ids_by_content_type.items():
+            model = ContentType.objects.db_manager(using).get_for_id(
+                content_type_id
+            ).model_class()
+            models_by_content_type[content_type_id] = model
+
+            if model is None:
+                # stale content type
+                continue
+
+            query_set = model._base_manager.using(using)
+
+            if isinstance(select_related, dict):
+                related = select_related.get(model)
+            else:
+                related = select_related
+
+            if related:
+                query_set = query_set.select_related(*related)
+
+            for chunk in iter_chunks(ids, chunk_size):
+                for content_object in query_set.filter(pk__in=chunk):
+                    content_objects[(content_type_id,
+                                     content_object.pk)] = content_object
+
+        for obj in objs:
+            content_type_id = getattr(obj, ct_attname)
+            model = models_by_content_type.get(content_type_id)
+            content_object = None
+
+            if model is not None:
+                object_id = model._meta.pk.to_python(getattr(obj,
+                                                             field.fk_field))
+                content_object = content_objects.get((content_type_id,
+                                                      object_id))
+
+            set_cached_content_object(obj=obj,
+                                      field=field,
+                                      content_object=content_object)
+
+
+def set_cached_content_object(obj, field, content_object):
+    """Sets the cached content object for a generic foreign key so accessing
+    the generic foreign key doesn't query the db.
+    """
+    if hasattr(field, 'set_cached_value'):
+        # django >= 2.0
+        field.set_cached_value(obj, content_object)
+    else:
+        setattr(obj, field.cache_attr, content_object)
+
+
+class GenericManager(BaseManager):
     """Model manager for models that have generic objects."""
 
+    def get_queryset(self):
+        return GenericQuerySet(model=self.model, using=self._db,
+                               hints=self._hints)
+
+    def with_content_objects(self, select_related=None):
+        """Gets all objects with the content objects resolved with a query
+        per content type.  See GenericQuerySet.with_content_objects.
+        """
+        return self.get_queryset().with_content_objects(
+            select_related=select_related
+        )
+
     def create_generic(self, content_object=None, **kwargs):
         """Create a generic object.
 
@@ -264,6 +1310,57 @@ class GenericManager(models.Manager):
 
         return self.filter(**kwargs)
 
+    def filter_generic_many(self, content_objects, group_by_object=False,
+                            **kwargs):
+        """Filter by many generic objects with a single query.  The content
+        objects are grouped by content type and the query OR's together a
+        (content_type, object_id__in) lookup for each content type.
+
+        :param content_objects: list of content objects (of any models) to
+            filter on.
+        :param group_by_object: boolean indicating if the results should be
+            returned as an ordered dict of {content_object: [objects]} in the
+            same order as the content objects instead of a queryset.
+        :param kwargs: additional filter criteria.
+        """
+        content_objects = list(content_objects)
+        ids_by_model = OrderedDict()
+
+        for content_object in content_objects:
+            ids_by_model.setdefault(content_object.__class__, set()).add(
+                content_object.id
+            )
+
+        query = Q()
+        content_types = ContentType.objects.get_for_models(*ids_by_model)
+
+        for model, ids in ids_by_model.items():
+            query |= Q(content_type=content_types[model], object_id__in=ids)
+
+        if ids_by_model:
+            query_set = self.filter(query, **kwargs)
+        else:
+            query_set = self.none()
+
+        if not group_by_object:
+            return query_set
+
+        groups = OrderedDict()
+        keys = {}
+
+        for content_object in content_objects:
+            content_type = content_types[content_object.__class__]
+            key = (content_type.id, content_object.id)
+
+            if key not in keys:
+                keys[key] = content_object
+                groups[content_object] = []
+
+        for obj in query_set:
+            groups[keys[(obj.content_type_id, obj.object_id)]].append(obj)
+
+        return groups
+
     def get_or_create_generic(self, content_object=None, **kwargs):
         """Gets or creates a generic object.  This is a wrapper for
         get_or_create(...) when you need to get or create a generic object.
@@ -279,6 +1376,103 @@ class GenericManager(models.Manager):
 
         return self.get_or_create(**kwargs)
 
+    def bulk_get_or_create_generic(self, content_objects, defaults=None,
+                                   max_attempts=3, **kwargs):
+        """Gets or creates a generic object for each content object.  Existing
+        objects are fetched with a single query and the missing objects are
+        inserted with a single bulk insert.  If a concurrent insert causes an
+        IntegrityError (for models with a unique constraint on the generic
+        fields), the existing objects are fetched again and only the objects
+        that are still missing are inserted.
+
+        :param content_objects: list of content objects (of any models) to get
+            or create generic objects for.
+        :param defaults: dict of additional field values for objects that are
+            created.
+        :param max_attempts: the max number of times to try inserting the
+            missing objects before the IntegrityError is raised.
+        :param kwargs: any other fields to get the objects by.  These are also
+            used when creating objects.
+        :return: list of (obj, created) tuples in the same order as the
+            content objects.
+        """
+        content_objects = list(content_objects)
+        content_types = ContentType.objects.get_for_models(
+            *set(content_object.__class__ for content_object in content_objects)
+        )
+
+        def get_key(content_object):
+            content_type = content_types[content_object.__class__]
+            return (content_type.id, content_object.id)
+
+        def get_existing(content_objects):
+            existing = {}
+
+            if not content_objects:
+                return existing
+
+            with use_primary():
+                for obj in self.filter_generic_many(content_objects, **kwargs):
+                    existing.setdefault((obj.content_type_id, obj.object_id),
+                                        obj)
+
+            return existing
+
+        existing = get_existing(content_objects)
+        created = {}
+
+        for attempt in range(1, max_attempts + 1):
+            missing = OrderedDict()
+
+            for content_object in content_objects:
+                key = get_key(content_object)
+
+                if key not in existing and key not in missing:
+                    missing[key] = content_object
+
+            if not missing:
+                break
+
+            new_objs = []
+
+            for content_object in missing.values():
+                values = dict(kwargs, **(defaults or {}))
+                values['content_type'] = content_types[
+                    content_object.__class__
+                ]
+                values['object_id'] = content_object.id
+                new_objs.append(self.model(**values))
+
+            try:
+                with transaction.atomic(using=self.db_for_write):
+                    self.bulk_create(new_objs)
+            except IntegrityError:
+                if attempt >= max_attempts:
+                    raise
+
+                existing.update(get_existing(list(missing.values())))
+                continue
+
+            if all(obj.pk is not None for obj in new_objs):
+                created_objs = dict((key, obj)
+                                    for key, obj in zip(missing, new_objs))
+            else:
+                # most db backends don't set the pk on bulk insert
+                created_objs = get_existing(list(missing.values()))
+
+            existing.update(created_objs)
+            created.update(created_objs)
+            break
+
+        results = []
+
+        for content_object in content_objects:
+            key = get_key(content_object)
+            # only the first occurrence of a created object is created
+            results.append((existing[key], created.pop(key, None) is not None))
+
+        return results
+
     def get_by_content_type(self, content_type):
         """Gets all objects by a content type."""
         return self.filter(content_type=content_type)
@@ -287,3 +1481,154 @@ class GenericManager(models.Manager):
         """Gets all object by a specific model."""
         content_type = ContentType.objects.get_for_model(model)
         return self.filter(content_type=content_type)
+
+
+class ExpiresQuerySet(models.QuerySet):
+    """QuerySet for models that expire (see AbstractExpiresModelMixin)."""
+
+    def active(self, now=None):
+        """Gets the objects that haven't expired.  Objects without an
+        expires_dttm never expire.
+
+        :param now: the utc datetime to check against.  Defaults to now.
+        """
+        return self.filter(Q(expires_dttm__isnull=True) |
+                           Q(expires_dttm__gt=now or datetime.utcnow()))
+
+    def expired(self, now=None):
+        """Gets the objects that have expired.
+
+        :param now: the utc datetime to check against.  Defaults to now.
+        """
+        return self.filter(expires_dttm__lte=now or datetime.utcnow())
+
+
+class ExpiresManager(CommonManager):
+    """Manager for models that expire (see AbstractExpiresModelMixin)."""
+
+    def get_queryset(self):
+        return ExpiresQuerySet(model=self.model,
+                               using=self._db,
+                               hints=self._hints)
+
+    def active(self, now=None):
+        """Gets the objects that haven't expired."""
+        return self.get_queryset().active(now=now)
+
+    def expired(self, now=None):
+        """Gets the objects that have expired."""
+        return self.get_queryset().expired(now=now)
+
+    def delete_expired(self, batch_size=None, sleep=0, progress=None,
+                       archive=None, **kwargs):
+        """Deletes the expired objects in batches.  See delete_in_batches.
+
+        :param kwargs: additional filter criteria for the objects to delete.
+        :return: the number of objects deleted.
+        """
+        return self.delete_in_batches(batch_size=batch_size,
+                                      sleep=sleep,
+                                      progress=progress,
+                                      archive=archive,
+                                      expires_dttm__lte=datetime.utcnow(),
+                                      **kwargs)
+
+
+class SafeDeleteQuerySet(models.QuerySet):
+    """QuerySet for models that are safe deleted (see
+    AbstractSafeDeleteModelMixin).
+    """
+
+    def delete_safe(self):
+        """Safe deletes all objects in the queryset with a single UPDATE.
+
+        :return: the number of objects safe deleted.
+        """
+        manager = self.model._default_manager
+        cache_lookups = getattr(manager, 'cache_lookups', False)
+        query_set = self.filter(is_deleted=False)
+        values = {'is_deleted': True}
+        ids = None
+
+        if 'last_modified_dttm' in [field.name for field in
+                                    self.model._meta.concrete_fields]:
+            values['last_modified_dttm'] = datetime.utcnow()
+
+        if is_identity_map_active() or cache_lookups:
+            # the ids are only needed to clear the identity map and cache
+            ids = list(query_set.values_list('pk', flat=True))
+            query_set = self.model._base_manager.using(self.db).filter(
+                pk__in=ids
+            )
+
+        count = query_set.update(**values)
+        pin_to_primary()
+
+        if ids is not None:
+            for id in ids:
+                evict_identity_pk(model=self.model, pk=id)
+
+            if cache_lookups:
+                manager.cache_set_deleted(ids=ids)
+
+        return count
+
+    def deleted(self):
+        """Gets the objects that have been safe deleted."""
+        return self.filter(is_deleted=True)
+
+
+class SafeDeleteManager(CommonManager):
+    """Manager for models that are safe deleted which only returns the objects
+    that haven't been deleted.
+
+    Like delete(), delete_safe() is only available on querysets so the whole
+    table can't be safe deleted by accident with MyModel.objects.delete_safe().
+    """
+    # boolean indicating if safe deleted objects should be included
+    include_deleted = False
+
+    def get_queryset(self):
+        query_set = self._get_all_queryset()
+
+        if self.include_deleted:
+            return query_set
+
+        return query_set.filter(is_deleted=False)
+
+    def _get_all_queryset(self):
+        return SafeDeleteQuerySet(model=self.model,
+                                  using=self._db,
+                                  hints=self._hints)
+
+    def deleted(self):
+        """Gets the objects that have been safe deleted."""
+        return self._get_all_queryset().deleted()
+
+
+class SafeDeleteAllManager(SafeDeleteManager):
+    """Manager for models that are safe deleted which returns all objects
+    including the ones that have been deleted.
+    """
+    include_deleted = True
+
+
+def connect_cache_hooks(sender, **kwargs):
+    """Connects the post_save and post_delete hooks (see AbstractBaseModel) for
+    models whose default manager caches lookups so the cache is updated when
+    an object is saved or deleted.
+    """
+    manager = getattr(sender, '_default_manager', None)
+
+    if (not getattr(manager, 'cache_lookups', False) or
+            not hasattr(sender, 'post_save')):
+        return
+
+    # Connecting the same classmethods more than once is a noop, so it's safe
+    # if the hooks have also been explicitly connected.
+    post_save.connect(sender.post_save, sender=sender)
+    post_delete.connect(sender.post_delete, sender=sender)
+
+
+class_prepared.connect(connect_cache_hooks,
+                       dispatch_uid='django_core_connect_cache_hooks')
@@ -4,10 +4,15 @@ from copy import deepcopy
 from datetime import datetime
 
 from django.conf import settings
+from django.db import DatabaseError
 from django.db import models
+from django.db.models.base import ModelState
+from django.db.models.signals import class_prepared
 from django.utils.encoding import python_2_unicode_compatible
+from django_core.db.models.identity import evict_identity
 from django_core.db.models.managers import CommonManager
 from django_core.db.models.mixins.dates import AbstractDateTimeTrackingModelMixin
+from django_core.db.pinning import pin_to_primary
 from django_core.utils.list_utils import make_obj_list
 
 
@@ -23,6 +28,11 @@ class AbstractBaseModel(AbstractDateTimeTrackingModelMixin):
     * last_modified: last user to modify this instance
     * last_modified_dttm: updated datetime. Datetime this document was last
         updated.
+
+    Setting track_dirty_fields to True snapshots the field values of instances
+    loaded from the db.  Saving one of those instances then only updates the
+    fields that changed (see get_dirty_fields) and skips the update entirely
+    when nothing changed.
     """
     created_user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -31,6 +41,7 @@ class AbstractBaseModel(AbstractDateTimeTrackingModelMixin):
         settings.AUTH_USER_MODEL,
         related_name='%(app_label)s_%(class)s_last_modified_user+')
     objects = CommonManager()
+    track_dirty_fields = False
 
     class Meta:
         abstract = True
@@ -45,14 +56,149 @@ class AbstractBaseModel(AbstractDateTimeTrackingModelMixin):
     def __str__(self):
         return str(self.id)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(AbstractBaseModel, cls).from_db(db, field_names,
+                                                         values)
+
+        if cls.track_dirty_fields:
+            instance._snapshot_field_values()
+
+        return instance
+
     def save(self, *args, **kwargs):
         """Optional kwargs:
 
         * id_length: the length of characters to use for the id.  Default
             is 10.
+
+        If track_dirty_fields is True and no update_fields are given, only the
+        fields that changed since the instance was loaded (or last saved) are
+        updated along with last_modified_dttm.  If no fields changed, nothing
+        is saved.  If the row was deleted in the meantime, the instance is
+        saved in full (inserted again) like an untracked save.
         """
+        loaded_values = getattr(self, '_loaded_field_values', None)
+        track_dirty_fields = (
+            self.track_dirty_fields and
+            loaded_values is not None and
+            not self._state.adding and
+            not args and
+            not kwargs.get('force_insert') and
+            kwargs.get('update_fields') is None
+        )
+
+        if track_dirty_fields:
+            last_modified_dttm = self.last_modified_dttm
+
         self.__class__.save_prep(self)
-        return super(AbstractBaseModel, self).save(*args, **kwargs)
+
+        if track_dirty_fields:
+            dirty_fields = [attname for attname in self.get_dirty_fields()
+                            if attname != 'last_modified_dttm']
+
+            if not dirty_fields:
+                self.last_modified_dttm = last_modified_dttm
+                return None
+
+            kwargs['update_fields'] = dirty_fields + ['last_modified_dttm']
+
+        evict_identity(self)
+        self._saving_dirty_fields = track_dirty_fields
+
+        try:
+            result = super(AbstractBaseModel, self).save(*args, **kwargs)
+        finally:
+            self._saving_dirty_fields = False
+
+        pin_to_primary()
+
+        if self.track_dirty_fields:
+            self._snapshot_field_values(
+                field_names=kwargs.get('update_fields')
+            )
+
+        return result
+
+    def _save_table(self, raw=False, cls=None, force_insert=False,
+                    force_update=False, using=None, update_fields=None):
+        try:
+            return super(AbstractBaseModel, self)._save_table(
+                raw, cls, force_insert, force_update, using, update_fields
+            )
+        except DatabaseError as e:
+            # django raises a plain DatabaseError (not caused by a db error)
+            # when saving the dirty fields doesn't match the row because it
+            # was deleted.  Anything else is a real error.
+            if (not getattr(self, '_saving_dirty_fields', False) or
+                    type(e) is not DatabaseError or
+                    getattr(e, '__cause__', None) is not None):
+                raise
+
+        return super(AbstractBaseModel, self)._save_table(
+            raw, cls, force_insert, force_update, using, None
+        )
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super(AbstractBaseModel, self).refresh_from_db(using=using,
+                                                       fields=fields,
+                                                       **kwargs)
+
+        if self.track_dirty_fields:
+            # the fresh db values are the new baseline for dirty fields
+            self._snapshot_field_values(field_names=fields)
+
+    def delete(self, *args, **kwargs):
+        evict_identity(self)
+        result = super(AbstractBaseModel, self).delete(*args, **kwargs)
+        pin_to_primary()
+        return result
+
+    def get_dirty_fields(self):
+        """Gets the attnames of the fields whose values changed since the
+        instance was loaded from the db (or last saved).  Only available when
+        track_dirty_fields is True.  Deferred fields that were loaded after
+        the instance was fetched are always considered dirty.
+        """
+        loaded_values = getattr(self, '_loaded_field_values', None) or {}
+        dirty_fields = []
+
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+
+            value = self.__dict__[field.attname]
+
+            if (field.attname not in loaded_values or
+                    loaded_values[field.attname] != value):
+                dirty_fields.append(field.attname)
+
+        return dirty_fields
+
+    def _snapshot_field_values(self, field_names=None):
+        """Snapshots the loaded (non-deferred) field values so changes can be
+        found on save.  Mutable values are copied so in place changes are
+        found too.
+
+        :param field_names: names or attnames of the fields to snapshot.  If
+            None, the snapshot is taken for all fields.
+        """
+        if field_names is None:
+            self._loaded_field_values = {}
+        else:
+            field_names = set(field_names)
+
+        loaded_values = self.__dict__.setdefault('_loaded_field_values', {})
+
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+
+            if (field_names is None or field.name in field_names or
+                    field.attname in field_names):
+                loaded_values[field.attname] = _copy_field_value(
+                    self.__dict__[field.attname]
+                )
 
     def get_verbose_name(self):
         """Gets the verbose name for an object."""
@@ -107,22 +253,64 @@ class AbstractBaseModel(AbstractDateTimeTrackingModelMixin):
             if not instance.created_dttm:
                 instance.created_dttm = utc_now
 
-            if instance.created_user:
+            if instance.created_user_id:
                 if not hasattr(instance, 'last_modified') or \
                    not instance.last_modified:
-                    instance.last_modified_user = instance.created_user
+                    cls._set_last_modified_user_to_created_user(instance)
 
             instance.strip_fields()
 
+    @classmethod
+    def _set_last_modified_user_to_created_user(cls, instance):
+        """Sets the last modified user to the created user without fetching
+        the created user from the db if it hasn't been loaded.
+        """
+        created_user_cache = cls._meta.get_field(
+            'created_user'
+        ).get_cache_name()
+        created_user = instance.__dict__.get(created_user_cache)
+
+        if created_user is not None:
+            instance.last_modified_user = created_user
+        elif instance.last_modified_user_id != instance.created_user_id:
+            last_modified_user_cache = cls._meta.get_field(
+                'last_modified_user'
+            ).get_cache_name()
+            instance.__dict__.pop(last_modified_user_cache, None)
+            instance.last_modified_user_id = instance.created_user_id
+
     def strip_fields(self):
         """Strips whitespace from all text related model fields. This includes
         CharField and TextFields and all subclasses of those two fields.
+
+        Only values that have leading or trailing whitespace are set and
+        deferred fields that haven't been loaded are skipped.
+        """
+        for attname in self.get_text_field_attnames():
+            value = self.__dict__.get(attname)
+
+            if (value and hasattr(value, 'strip') and
+                    (value[0].isspace() or value[-1].isspace())):
+                setattr(self, attname, value.strip())
+
+    @classmethod
+    def get_text_field_attnames(cls):
+        """Gets the attnames of the CharField and TextField (and subclasses of
+        those two fields) fields for the model.  This is computed once per
+        model when the model class is prepared.
         """
-        for field in self._meta.fields:
-            if isinstance(field, (models.CharField, models.TextField)):
-                value = getattr(self, field.name)
-                if value and hasattr(value, 'strip'):
-                    setattr(self, field.name, value.strip())
+        # check the class' own __dict__ so a child model never uses the field
+        # plan of the model it inherits from.
+        attnames = cls.__dict__.get('_text_field_attnames')
+
+        if attnames is None:
+            attnames = tuple(
+                field.attname for field in cls._meta.concrete_fields
+                if isinstance(field, (models.CharField, models.TextField))
+            )
+            cls._text_field_attnames = attnames
+
+        return attnames
 
     def copy(self, exclude_fields=None, **override_fields):
         """Returns an unsaved copy of this object with all fields except for
@@ -148,23 +336,51 @@ class AbstractBaseModel(AbstractDateTimeTrackingModelMixin):
             >> new_obj.my_field
             'hello world'
 
+        The copy is a field level copy of the object.  Related objects that
+        have been loaded are shared with the copy and mutable values (lists,
+        dicts and sets) are copied.
         """
-        if not exclude_fields:
-            exclude_fields = []
-
-        exclude_fields += ['created_dttm', 'last_modified_dttm']
-        # Don't copy data for any unique fields.  These must be explicitly set.
-        exclude_fields += [field.name
-                           for field in self._meta.fields if field.unique]
-        instance = deepcopy(self)
-        instance.last_modified_user = instance.created_user
-        instance.last_modified_user_id = instance.created_user_id
-
-        # unset all the attributes that you don't want copied over
-        for field in set(exclude_fields):
-            meta = self.__class__._meta
-            default = meta.get_field(field_name=field).get_default()
-            setattr(instance, field, default or None)
+        cls = self.__class__
+
+        if getattr(cls, '_deferred', False):
+            # copy as the model the deferred class was created for
+            cls = cls._meta.proxy_for_model
+
+        fields, default_exclude_fields = cls._get_copy_plan()
+        exclude_fields = default_exclude_fields.union(exclude_fields or [])
+        excluded = set()
+
+        # Build the copy without deepcopying the instance (which would also
+        # copy _state, cached related objects and prefetch caches).
+        instance = cls.__new__(cls)
+        instance._state = ModelState()
+        values = instance.__dict__
+
+        for field, cache_name, default in fields:
+            if field.name in exclude_fields or field.attname in exclude_fields:
+                if default is _CALLABLE_DEFAULT:
+                    default = field.get_default() or None
+
+                values[field.attname] = default
+                excluded.update((field.name, field.attname))
+                continue
+
+            if field.attname in self.__dict__:
+                value = self.__dict__[field.attname]
+            else:
+                # deferred field
+                value = getattr(self, field.attname)
+
+            values[field.attname] = _copy_field_value(value)
+
+            if cache_name and cache_name in self.__dict__:
+                values[cache_name] = self.__dict__[cache_name]
+
+        for field_name in exclude_fields.difference(excluded):
+            default = cls._meta.get_field(field_name).get_default()
+            setattr(instance, field_name, default or None)
+
+        cls._set_last_modified_user_to_created_user(instance)
 
         if override_fields:
             for field, val in override_fields.items():
@@ -172,6 +388,76 @@ class AbstractBaseModel(AbstractDateTimeTrackingModelMixin):
 
         return instance
 
+    def copy_many(self, n_or_overrides, exclude_fields=None,
+                  **override_fields):
+        """Returns a list of unsaved copies of this object (see copy).  The
+        copies are ready to be passed to CommonManager.bulk_create.
+
+        :param n_or_overrides: the number of copies to make or a list of dicts
+            of override fields with one dict per copy.
+        :param exclude_fields: fields to exclude from the copies.
+        :param override_fields: fields to override on all copies.  The per copy
+            overrides take precedence.
+
+            Example:
+
+            >> objs = some_obj.copy_many([{'slug': 'a'}, {'slug': 'b'}])
+            >> MyModel.objects.bulk_create(objs)
+
+        """
+        if isinstance(n_or_overrides, int):
+            overrides_list = [{}] * n_or_overrides
+        else:
+            overrides_list = n_or_overrides
+
+        copies = []
+
+        for overrides in overrides_list:
+            copy_override_fields = dict(override_fields)
+            copy_override_fields.update(overrides)
+            copies.append(self.copy(exclude_fields=exclude_fields,
+                                    **copy_override_fields))
+
+        return copies
+
+    @classmethod
+    def _get_copy_plan(cls):
+        """Gets the fields plan used by copy.  This is computed once per model.
+
+        :return: tuple of (fields, exclude_fields) where fields is a list of
+            (field, related object cache name, default value) tuples for the
+            concrete fields and exclude_fields is the set of field names that
+            are never copied (created_dttm, last_modified_dttm and unique
+            fields).
+        """
+        plan = cls.__dict__.get('_copy_plan')
+
+        if plan is None:
+            fields = []
+
+            for field in cls._meta.concrete_fields:
+                if field.has_default() and callable(field.default):
+                    default = _CALLABLE_DEFAULT
+                else:
+                    default = field.get_default() or None
+
+                if field.is_relation:
+                    cache_name = field.get_cache_name()
+                else:
+                    cache_name = None
+
+                fields.append((field, cache_name, default))
+
+            exclude_fields = frozenset(
+                ['created_dttm', 'last_modified_dttm'] +
+                [field.name for field in cls._meta.concrete_fields
+                 if field.unique]
+            )
+            plan = (fields, exclude_fields)
+            cls._copy_plan = plan
+
+        return plan
+
     @classmethod
     def _get_many_to_many_model(cls, field_name):
         """Get the model for the many to many field.
@@ -188,15 +474,54 @@ class AbstractBaseModel(AbstractDateTimeTrackingModelMixin):
 
     @classmethod
     def post_save(cls, *args, **kwargs):
-        """Adding a hook here so it's safe to call the super's post_save."""
-        pass
+        """Adding a hook here so it's safe to call the super's post_save.
+
+        If the default manager caches lookups, this points the cache at the
+        saved version of the instance.
+        """
+        cls._update_cached_version(instance=kwargs.get('instance'))
 
     @classmethod
     def post_delete(cls, *args, **kwargs):
-        """Adding a hook here so it's safe to call the super's post_delete."""
-        pass
+        """Adding a hook here so it's safe to call the super's post_delete.
+
+        If the default manager caches lookups, this removes the deleted
+        instance from the cache.
+        """
+        cls._update_cached_version(instance=kwargs.get('instance'),
+                                   deleted=True)
+
+    @classmethod
+    def _update_cached_version(cls, instance, deleted=False):
+        manager = cls._default_manager
+
+        if instance is not None and getattr(manager, 'cache_lookups', False):
+            manager.cache_set_version(obj=instance, deleted=deleted)
 
     @classmethod
     def m2m_changed(cls, *args, **kwargs):
         """Adding a hook here so it's safe to call the super's m2m_changed."""
         pass
+
+
+# Marks a field default that has to be called for every copy.
+_CALLABLE_DEFAULT = object()
+
+
+def _copy_field_value(value):
+    if isinstance(value, (dict, list, set)):
+        return deepcopy(value)
+
+    return value
+
+
+def prepare_text_field_attnames(sender, **kwargs):
+    """Computes the text field plan used by save_prep for models extending
+    AbstractBaseModel when the model class is prepared.
+    """
+    if issubclass(sender, AbstractBaseModel):
+        sender.get_text_field_attnames()
+
+
+class_prepared.connect(prepare_text_field_attnames,
+                       dispatch_uid='django_core_prepare_text_field_attnames')
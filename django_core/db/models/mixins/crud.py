@@ -1,27 +1,69 @@
+from __future__ import unicode_literals
+
 from django.db import models
+from django.utils.translation import ugettext as _
 
+from django_core.db.models.managers import ReadOnlyManager
+from django_core.db.models.managers import SafeDeleteAllManager
+from django_core.db.models.managers import SafeDeleteManager
 from django_core.exceptions import NotAllowed
 
 
 class AbstractSafeDeleteModelMixin(models.Model):
     """Give a model safe delete logic so an indicator can be set to is_deleted
     and not removed from the database.
+
+    The default manager ("objects") only returns objects that haven't been
+    deleted.  Use "all_objects" to include the deleted objects.  This mixin
+    must come before AbstractBaseModel in the bases, otherwise "objects" (and
+    the default manager) is AbstractBaseModel's CommonManager:
+
+    >> class MyModel(AbstractSafeDeleteModelMixin, AbstractBaseModel):
+    ...     pass
+
+    To safe delete many objects with a single UPDATE:
+
+    >> MyModel.objects.filter(some_field='value').delete_safe()
+
+    Tables with many deleted rows should add a partial index on the live rows
+    (see django_core.db.migrations.AddPartialIndex).
     """
     is_deleted = models.BooleanField(default=False)
 
+    objects = SafeDeleteManager()
+    all_objects = SafeDeleteAllManager()
+
     class Meta:
         abstract = True
 
     def delete_safe(self):
         self.is_deleted = True
-        self.save()
+
+        if self._state.adding:
+            # an unsaved object is inserted as deleted
+            self.save()
+            return
+
+        update_fields = ['is_deleted']
+
+        if 'last_modified_dttm' in [field.name for field in
+                                    self._meta.concrete_fields]:
+            update_fields.append('last_modified_dttm')
+
+        self.save(update_fields=update_fields)
 
 
 class ReadOnlyModelMixin(models.Model):
     """This is a wrapper class around a model so all methods and fields
     can be used the same as the extending model, but this doesn't allow the 
     model instance to be saved.
+
+    The default manager (ReadOnlyManager) caches primary key lookups in
+    process.  Reads can be sent to a replica db with the ReadOnlyModelRouter
+    (see django_core.db.routers).
     """
+    objects = ReadOnlyManager()
+
     class Meta:
         abstract = True
 
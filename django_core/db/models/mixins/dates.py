@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from django.db import models
+from django_core.db.models.managers import ExpiresManager
 
 
 class AbstractDateTimeTrackingModelMixin(models.Model):
@@ -27,8 +28,28 @@ class AbstractExpiresModelMixin(models.Model):
     Fields:
 
     - expires_dttm: the UTC date time that the model object expires.
+
+    The default manager (ExpiresManager) gets the active and expired objects
+    in the db:
+
+    >> MyModel.objects.active()
+    >> MyModel.objects.expired()
+
+    This mixin must come before AbstractBaseModel in the bases, otherwise
+    "objects" (and the default manager) is AbstractBaseModel's CommonManager:
+
+    >> class MyModel(AbstractExpiresModelMixin, AbstractBaseModel):
+    ...     pass
+
+    Expired objects can be deleted in batches with the "sweep_expired"
+    management command or in process with an ExpiredSweeper thread (see
+    django_core.db.models.sweepers).  If the model has an "archive_expired"
+    classmethod, it's called with each batch of expired objects before they're
+    deleted.
     """
-    expires_dttm = models.DateTimeField(blank=True, null=True)
+    expires_dttm = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    objects = ExpiresManager()
 
     class Meta:
         abstract = True
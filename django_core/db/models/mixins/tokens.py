@@ -1,14 +1,32 @@
 from __future__ import unicode_literals
 
+from django.db import IntegrityError
 from django.db import models
+from django.db import router
+from django.db import transaction
 from django_core.db.models import TokenManager
 from django_core.utils.list_utils import make_obj_list
+from django_core.utils.random_utils import random_alphanum
 
 
 class AbstractTokenModel(models.Model):
-    """Abstract class for token logic."""
+    """Abstract class for token logic.
+
+    Tokens are allocated in one of two ways depending on precheck_tokens:
+
+    * True (default): available tokens are looked up in the db before the
+        object is saved.
+    * False: tokens are generated without looking anything up in the db and
+        the unique constraint on the token column is relied on instead.  If
+        the insert fails because a generated token is already taken, only the
+        collided tokens are regenerated and the insert is retried (up to
+        token_max_attempts times).  This saves a query per save and turns the
+        race between checking and inserting a token into a controlled retry.
+    """
     token = models.CharField(max_length=100, db_index=True, unique=True)
     token_length = 15
+    precheck_tokens = True
+    token_max_attempts = 5
     objects = TokenManager()
 
     class Meta:
@@ -16,8 +34,36 @@ class AbstractTokenModel(models.Model):
 
     def save(self, *args, **kwargs):
         """Make sure token is added."""
+        retry_token = not self.token and not self.precheck_tokens
         self.save_prep(instance_or_instances=self)
-        return super(AbstractTokenModel, self).save(*args, **kwargs)
+
+        if not retry_token:
+            return super(AbstractTokenModel, self).save(*args, **kwargs)
+
+        using = kwargs.get('using') or router.db_for_write(self.__class__,
+                                                          instance=self)
+
+        for attempt in range(1, self.token_max_attempts + 1):
+            try:
+                with transaction.atomic(using=using):
+                    return super(AbstractTokenModel, self).save(*args,
+                                                                **kwargs)
+            except IntegrityError:
+                token_taken = self.__class__._default_manager.using(
+                    using
+                ).filter(token=self.token).exists()
+
+                if attempt >= self.token_max_attempts or not token_taken:
+                    # either the error wasn't caused by the token or there
+                    # have been too many attempts
+                    raise
+
+                self.token = self.generate_token()
+
+    @classmethod
+    def generate_token(cls):
+        """Generates a new random token without checking the db."""
+        return random_alphanum(length=cls.token_length)
 
     @classmethod
     def save_prep(cls, instance_or_instances):
@@ -25,15 +71,19 @@ class AbstractTokenModel(models.Model):
         automatically gets called when the save method gets called.
         """
         instances = make_obj_list(instance_or_instances)
+        tokenless = [instance for instance in instances if not instance.token]
 
-        tokens = set(cls.objects.get_available_tokens(
-            count=len(instances),
-            token_length=cls.token_length
-        ))
+        if tokenless:
+            if cls.precheck_tokens:
+                tokens = cls.objects.get_available_tokens(
+                    count=len(tokenless),
+                    token_length=cls.token_length
+                )
+            else:
+                tokens = [cls.generate_token() for instance in tokenless]
 
-        for instance in instances:
-            if not instance.token:
-                instance.token = tokens.pop()
+            for instance, token in zip(tokenless, tokens):
+                instance.token = token
 
         super(AbstractTokenModel, cls).save_prep(
             instance_or_instances=instances
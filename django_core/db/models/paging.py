@@ -0,0 +1,246 @@
+from __future__ import unicode_literals
+
+import base64
+import hashlib
+import json
+from collections import namedtuple
+
+from django.core.cache import caches
+from django.db import connections
+from django.db.models import Q
+from django.utils.encoding import force_bytes
+
+
+KeysetPage = namedtuple('KeysetPage', ('object_list', 'next_cursor',
+                                       'previous_cursor'))
+
+
+def encode_cursor(values, reverse=False):
+    """Encodes the ordering values of an object into an opaque cursor string.
+
+    :param values: list of string ordering values.
+    :param reverse: boolean indicating if the page for the cursor is before
+        (True) or after (False) the object the values are for.
+    """
+    data = json.dumps({'v': values, 'r': reverse}).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decodes a cursor created with encode_cursor(...).
+
+    :return: tuple of (values, reverse)
+    :raises ValueError: if the cursor isn't valid.
+    """
+    try:
+        data = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        )
+        return list(data['v']), bool(data['r'])
+    except Exception:
+        raise ValueError('Invalid cursor: {0}'.format(cursor))
+
+
+def get_keyset_page(query_set, cursor=None, size=15, ordering=None):
+    """Gets a page of objects using keyset (seek) pagination.  Instead of
+    skipping rows with an OFFSET, the query seeks past the ordering values of
+    the last object of the previous page, so a deep page costs the same as
+    the first page as long as the ordering fields are indexed.
+
+    :param query_set: the queryset to page through.
+    :param cursor: the cursor from a previous page (KeysetPage.next_cursor or
+        KeysetPage.previous_cursor).  If None, the first page is returned.
+    :param size: the number of objects per page.
+    :param ordering: list of the field names to order by.  All fields must be
+        ordered in the same direction and can't be nullable.  The primary key
+        is added to make the ordering unique if it's not already included.
+        Defaults to the queryset's ordering or the model's default ordering.
+    :return: KeysetPage with the objects for the page and the cursors for the
+        next and previous pages (None if there isn't a next or previous page).
+    :raises ValueError: if the cursor or ordering isn't valid.
+    """
+    meta = query_set.model._meta
+    ordering = list(ordering or query_set.query.order_by or
+                    meta.ordering or ['-pk'])
+    descending = ordering[0].startswith('-')
+    field_names = [field_name.lstrip('-') for field_name in ordering]
+
+    if any(field_name.startswith('-') != descending
+           for field_name in ordering):
+        raise ValueError('All ordering fields must be in the same direction.')
+
+    pk_names = ('pk', meta.pk.name, meta.pk.attname)
+
+    if not any(field_name in pk_names for field_name in field_names):
+        field_names.append('pk')
+
+    fields = [meta.pk if field_name == 'pk' else meta.get_field(field_name)
+              for field_name in field_names]
+
+    if any(field.null for field in fields):
+        # NULLs can't be compared to seek past them
+        raise ValueError('Ordering fields can\'t be nullable.')
+
+    reverse = False
+
+    if cursor:
+        values, reverse = decode_cursor(cursor)
+
+        if len(values) != len(fields):
+            raise ValueError('Invalid cursor: {0}'.format(cursor))
+
+        values = [field.to_python(value)
+                  for field, value in zip(fields, values)]
+        # seek forward with "greater than" for ascending orderings and
+        # backward with "less than" (and vice versa for descending orderings)
+        lookup = 'lt' if descending != reverse else 'gt'
+        query = Q()
+
+        for i, field in enumerate(fields):
+            filters = dict((fields[j].attname, values[j]) for j in range(i))
+            filters['{0}__{1}'.format(field.attname, lookup)] = values[i]
+            query |= Q(**filters)
+
+        query_set = query_set.filter(query)
+
+    page_descending = descending != reverse
+    order_by = ['{0}{1}'.format('-' if page_descending else '', field.attname)
+                for field in fields]
+    objs = list(query_set.order_by(*order_by)[:size + 1])
+    has_more = len(objs) > size
+    objs = objs[:size]
+
+    if reverse:
+        objs.reverse()
+        has_next = True
+        has_previous = has_more
+    else:
+        has_next = has_more
+        has_previous = bool(cursor)
+
+    def get_cursor(obj, reverse):
+        return encode_cursor(values=[field.value_to_string(obj)
+                                     for field in fields],
+                             reverse=reverse)
+
+    return KeysetPage(
+        object_list=objs,
+        next_cursor=get_cursor(objs[-1], False) if objs and has_next else None,
+        previous_cursor=(get_cursor(objs[0], True)
+                         if objs and has_previous else None)
+    )
+
+
+class CountFreePage(object):
+    """A page of objects that was fetched without counting the total number of
+    objects.  This has the same interface as django's Page object except
+    there's no paginator and the total number of objects and pages aren't
+    known.
+    """
+    paginator = None
+
+    def __init__(self, object_list, number, size, has_next):
+        self.object_list = object_list
+        self.number = number
+        self.size = size
+        self._has_next = has_next
+
+    def __repr__(self):
+        return '<Page {0}>'.format(self.number)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+
+        return (self.number - 1) * self.size + 1
+
+    def end_index(self):
+        return (self.number - 1) * self.size + len(self.object_list)
+
+
+def get_count_free_page(query_set, page_num=1, size=15):
+    """Gets a page of objects without running a COUNT query.  One more object
+    than the page size is fetched to know if there's a next page.
+
+    :param query_set: the queryset to page through.
+    :param page_num: the page number (starting at 1).
+    :param size: the number of objects per page.
+    :return: CountFreePage
+    """
+    offset = (page_num - 1) * size
+    objs = list(query_set[offset:offset + size + 1])
+    return CountFreePage(object_list=objs[:size],
+                         number=page_num,
+                         size=size,
+                         has_next=len(objs) > size)
+
+
+def get_cached_count(query_set, timeout=300, cache_alias='default'):
+    """Gets the number of objects in a queryset.  The count is cached for
+    timeout seconds so the COUNT query only runs once per timeout for the same
+    query.
+    """
+    try:
+        sql = '{0}:{1}'.format(query_set.db, query_set.query)
+    except Exception:
+        # some queries (i.e. filtering by an empty list) can't be converted to
+        # sql.  Those don't hit the db when counting anyway.
+        return query_set.count()
+
+    cache_key = 'django_core:count:{0}'.format(
+        hashlib.md5(force_bytes(sql)).hexdigest()
+    )
+    cache = caches[cache_alias]
+    count = cache.get(cache_key)
+
+    if count is None:
+        count = query_set.count()
+        cache.set(cache_key, count, timeout)
+
+    return count
+
+
+def get_estimated_count(query_set, timeout=300, cache_alias='default'):
+    """Gets an estimated number of objects in a queryset.  For unfiltered
+    querysets on postgresql, the planner's row estimate for the table
+    (pg_class.reltuples) is used which doesn't scan the table.  Otherwise,
+    this falls back to the cached count (see get_cached_count).
+    """
+    connection = connections[query_set.db]
+
+    if connection.vendor == 'postgresql' and not query_set.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s',
+                           [query_set.model._meta.db_table])
+            row = cursor.fetchone()
+
+        if row and row[0] > 0:
+            return int(row[0])
+
+    return get_cached_count(query_set=query_set,
+                            timeout=timeout,
+                            cache_alias=cache_alias)
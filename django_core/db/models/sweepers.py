@@ -0,0 +1,126 @@
+from __future__ import unicode_literals
+
+import logging
+import threading
+
+from django.apps import apps
+from django.db import close_old_connections
+from django_core.db.models.managers import ExpiresManager
+from django_core.db.models.mixins.dates import AbstractExpiresModelMixin
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_expires_models():
+    """Gets all installed models that extend AbstractExpiresModelMixin.  Proxy
+    models are skipped since their rows are swept with the concrete model.
+    """
+    return [model for model in apps.get_models()
+            if issubclass(model, AbstractExpiresModelMixin) and
+            not model._meta.proxy]
+
+
+def get_expires_manager(model):
+    """Gets the manager that deletes the expired objects of the model.  This
+    is the default manager when it's an ExpiresManager.  Otherwise (i.e. the
+    model defines its own manager), it's an ExpiresManager bound to the model
+    that, like the model's base manager, doesn't filter any objects out.
+    """
+    manager = model._default_manager
+
+    if isinstance(manager, ExpiresManager):
+        return manager
+
+    manager = ExpiresManager()
+    manager.model = model
+    return manager
+
+
+def sweep_expired(models=None, batch_size=None, sleep=0, progress=None):
+    """Deletes the expired objects of the models in batches.  If a model has
+    an "archive_expired" classmethod, it's called with each batch of expired
+    objects before they're deleted.
+
+    :param models: list of models to sweep.  Defaults to all installed models
+        that extend AbstractExpiresModelMixin.
+    :param batch_size: the max number of objects to delete per batch.
+    :param sleep: the number of seconds to sleep between batches.
+    :param progress: optional callable that's called after each batch with the
+        model and the total number of objects deleted so far for the model.
+    :return: dict of {model: number of objects deleted}
+    """
+    if models is None:
+        models = get_expires_models()
+
+    deleted = {}
+
+    for model in models:
+        model_progress = None
+
+        if progress:
+            model_progress = (lambda total, model=model: progress(model, total))
+
+        deleted[model] = get_expires_manager(model).delete_expired(
+            batch_size=batch_size,
+            sleep=sleep,
+            progress=model_progress,
+            archive=getattr(model, 'archive_expired', None)
+        )
+
+    return deleted
+
+
+class ExpiredSweeper(threading.Thread):
+    """Daemon thread that deletes expired objects in the background every
+    interval seconds (see sweep_expired).
+
+    Example:
+
+    >> sweeper = ExpiredSweeper(interval=300)
+    >> sweeper.start()
+    >> ...
+    >> sweeper.stop()
+
+    :param interval: the number of seconds to wait between sweeps.
+    :param models: list of models to sweep.  Defaults to all installed models
+        that extend AbstractExpiresModelMixin.
+    :param batch_size: the max number of objects to delete per batch.
+    :param sleep: the number of seconds to sleep between batches.
+    """
+
+    def __init__(self, interval=300, models=None, batch_size=None, sleep=0):
+        super(ExpiredSweeper, self).__init__(name='ExpiredSweeper')
+        self.daemon = True
+        self.interval = interval
+        self.models = models
+        self.batch_size = batch_size
+        self.sleep = sleep
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            try:
+                self.sweep()
+            finally:
+                # this thread has its own db connection which django doesn't
+                # manage outside of the request cycle.
+                close_old_connections()
+
+            self._stopped.wait(self.interval)
+
+    def sweep(self):
+        """Runs a single sweep.  Errors are logged so the thread keeps
+        running.
+        """
+        try:
+            return sweep_expired(models=self.models,
+                                 batch_size=self.batch_size,
+                                 sleep=self.sleep)
+        except Exception:
+            logger.exception('Sweeping expired objects failed.')
+
+    def stop(self, timeout=None):
+        """Stops the sweeper after the current sweep."""
+        self._stopped.set()
+        self.join(timeout)
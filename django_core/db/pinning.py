@@ -0,0 +1,81 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+from contextlib import contextmanager
+
+from django_core.utils.loading import get_setting
+
+
+_local = threading.local()
+
+
+def get_replica_aliases():
+    """Gets the db aliases of the read replicas from the REPLICA_DB_ALIASES
+    setting.
+    """
+    return get_setting('REPLICA_DB_ALIASES', default=())
+
+
+def pin_to_primary(seconds=None):
+    """Pins reads of the current thread to the primary db for a window after
+    a write so the thread reads its own writes even if the replicas are
+    lagging.  This does nothing if no replicas are configured.
+
+    :param seconds: the number of seconds to pin for.  Defaults to the
+        REPLICA_PIN_SECONDS setting or 5 seconds.
+    """
+    if not get_replica_aliases():
+        return
+
+    if seconds is None:
+        seconds = get_setting('REPLICA_PIN_SECONDS', default=5)
+
+    set_pinned_until(max(time.time() + seconds, get_pinned_until() or 0))
+
+
+def unpin_from_primary():
+    """Removes the pin to the primary db for the current thread."""
+    _local.pinned_until = None
+
+
+def get_pinned_until():
+    """Gets the timestamp the current thread is pinned to the primary db until
+    or None if it's not pinned.
+    """
+    return getattr(_local, 'pinned_until', None)
+
+
+def set_pinned_until(timestamp):
+    """Pins the current thread to the primary db until the timestamp."""
+    _local.pinned_until = timestamp
+
+
+def is_pinned_to_primary():
+    """Boolean indicating if reads of the current thread should go to the
+    primary db.
+    """
+    if getattr(_local, 'use_primary', 0):
+        return True
+
+    pinned_until = get_pinned_until()
+    return pinned_until is not None and pinned_until > time.time()
+
+
+@contextmanager
+def use_primary():
+    """Context manager that sends all reads of the current thread to the
+    primary db for the duration of the block.
+
+    Example:
+
+    >> with use_primary():
+    ...     obj = MyModel.objects.get_by_id(5)
+
+    """
+    _local.use_primary = getattr(_local, 'use_primary', 0) + 1
+
+    try:
+        yield
+    finally:
+        _local.use_primary -= 1
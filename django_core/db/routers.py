@@ -0,0 +1,91 @@
+from __future__ import unicode_literals
+
+import random
+
+from django.db import DEFAULT_DB_ALIAS
+from django_core.db.models.mixins.crud import ReadOnlyModelMixin
+from django_core.db.pinning import get_replica_aliases
+from django_core.db.pinning import is_pinned_to_primary
+from django_core.utils.loading import get_setting
+
+
+class ReadOnlyModelRouter(object):
+    """Database router that sends reads of ReadOnlyModelMixin models to the
+    db alias in the READ_ONLY_MODEL_DB_ALIAS setting (i.e. a replica).  Since
+    the models are never saved, replication lag only delays changes made
+    outside of the ORM.
+
+    Example settings:
+
+    DATABASE_ROUTERS = ['django_core.db.routers.ReadOnlyModelRouter']
+    READ_ONLY_MODEL_DB_ALIAS = 'replica'
+
+    If the setting isn't set, routing falls through to the next router.
+    """
+
+    def db_for_read(self, model, **hints):
+        if issubclass(model, ReadOnlyModelMixin):
+            return get_setting('READ_ONLY_MODEL_DB_ALIAS', default=None)
+
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # read only objects loaded from the replica can be related to objects
+        # in the primary db.
+        if (isinstance(obj1, ReadOnlyModelMixin) or
+                isinstance(obj2, ReadOnlyModelMixin)):
+            return True
+
+        return None
+
+
+class ReplicaRouter(object):
+    """Database router that load balances reads across read replicas and
+    sends writes to the primary db.  After a write through
+    AbstractBaseModel.save(), delete() or the CommonManager bulk methods, the
+    thread's reads are pinned to the primary db for REPLICA_PIN_SECONDS so
+    the thread reads its own writes (see django_core.db.pinning).  Use the
+    ReplicaPinningMiddleware to carry the pin across a user's requests.
+
+    Example settings:
+
+    DATABASE_ROUTERS = ['django_core.db.routers.ReplicaRouter']
+    REPLICA_PRIMARY_DB_ALIAS = 'default'
+    REPLICA_DB_ALIASES = ['replica1', 'replica2']
+    REPLICA_PIN_SECONDS = 5
+
+    """
+
+    def get_primary_alias(self):
+        return get_setting('REPLICA_PRIMARY_DB_ALIAS',
+                           default=DEFAULT_DB_ALIAS)
+
+    def db_for_read(self, model, **hints):
+        replica_aliases = get_replica_aliases()
+
+        if not replica_aliases or is_pinned_to_primary():
+            return self.get_primary_alias()
+
+        return random.choice(replica_aliases)
+
+    def db_for_write(self, model, **hints):
+        return self.get_primary_alias()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = set(get_replica_aliases())
+        aliases.add(self.get_primary_alias())
+
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, *args, **hints):
+        # replicas get their schema from the primary
+        if db in get_replica_aliases():
+            return False
+
+        return None
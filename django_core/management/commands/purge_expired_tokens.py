@@ -0,0 +1,48 @@
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+from django_core.models import TokenAuthorization
+
+
+class Command(BaseCommand):
+    help = ('Deletes expired token authorizations in batches so the delete '
+            'can run without holding long locks.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size',
+                            dest='batch_size',
+                            type=int,
+                            default=1000,
+                            help='The max number of tokens to delete per '
+                                 'batch.')
+        parser.add_argument('--sleep',
+                            dest='sleep',
+                            type=float,
+                            default=0,
+                            help='The number of seconds to sleep between '
+                                 'batches.')
+        parser.add_argument('--reason',
+                            dest='reason',
+                            default=None,
+                            help='Only delete expired tokens for this reason.')
+
+    def handle(self, *args, **options):
+        verbosity = options.get('verbosity', 1)
+        kwargs = {}
+
+        if options.get('reason'):
+            kwargs['reason'] = options['reason']
+
+        def progress(total):
+            if verbosity > 0:
+                self.stdout.write('Deleted {0} expired tokens...'.format(total))
+
+        total = TokenAuthorization.objects.delete_expired(
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+            progress=progress,
+            **kwargs
+        )
+
+        if verbosity > 0:
+            self.stdout.write('Deleted {0} expired tokens.'.format(total))
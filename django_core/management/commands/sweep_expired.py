@@ -0,0 +1,72 @@
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django_core.db.models.mixins.dates import AbstractExpiresModelMixin
+from django_core.db.models.sweepers import get_expires_models
+from django_core.db.models.sweepers import sweep_expired
+
+
+class Command(BaseCommand):
+    help = ('Deletes expired objects of models that extend '
+            'AbstractExpiresModelMixin in batches.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('models',
+                            nargs='*',
+                            help='The models (app_label.ModelName) to sweep. '
+                                 'Defaults to all models that expire.')
+        parser.add_argument('--batch-size',
+                            dest='batch_size',
+                            type=int,
+                            default=1000,
+                            help='The max number of objects to delete per '
+                                 'batch.')
+        parser.add_argument('--sleep',
+                            dest='sleep',
+                            type=float,
+                            default=0,
+                            help='The number of seconds to sleep between '
+                                 'batches.')
+
+    def handle(self, *args, **options):
+        verbosity = options.get('verbosity', 1)
+
+        if options.get('models'):
+            models = [self.get_model(label) for label in options['models']]
+        else:
+            models = get_expires_models()
+
+        def progress(model, total):
+            if verbosity > 0:
+                self.stdout.write('Deleted {0} expired {1} objects...'.format(
+                    total, self.get_label(model)
+                ))
+
+        deleted = sweep_expired(models=models,
+                                batch_size=options['batch_size'],
+                                sleep=options['sleep'],
+                                progress=progress)
+
+        if verbosity > 0:
+            for model in models:
+                self.stdout.write('Deleted {0} expired {1} objects.'.format(
+                    deleted[model], self.get_label(model)
+                ))
+
+    def get_model(self, label):
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError) as e:
+            raise CommandError(e)
+
+        if not issubclass(model, AbstractExpiresModelMixin):
+            raise CommandError('{0} does not extend '
+                               'AbstractExpiresModelMixin.'.format(label))
+
+        return model
+
+    def get_label(self, model):
+        return '{0}.{1}'.format(model._meta.app_label,
+                                model._meta.object_name)
@@ -4,10 +4,22 @@ from datetime import datetime
 
 from .db.models.managers import CommonManager
 from .db.models.managers import TokenManager
+from .utils.list_utils import iter_chunks
 
 
 class TokenAuthorizationManager(TokenManager, CommonManager):
     """Model manager for token authorizations."""
+    # The max number of email addresses to expire tokens for in a single
+    # query.
+    email_chunk_size = 500
+
+    def get_valid_by_token(self, token, **kwargs):
+        """Gets a token authorization by token or None if one isn't found or
+        it has expired.  The expiration is checked in the query.
+        """
+        return self.get_or_none(token=token,
+                                expires__gt=datetime.utcnow(),
+                                **kwargs)
 
     def expire_by_email(self, email_address, **kwargs):
         """Expires tokens for an email address or email addresses.
@@ -16,6 +28,9 @@ class TokenAuthorizationManager(TokenManager, CommonManager):
             expire tokens for.
         :param reason: the codified reason for the tokens.  If explicitly set
             to None, this will expire all tokens for the email provided.
+
+        Lists of email addresses are expired in chunks of email_chunk_size
+        addresses per query.
         """
         if not email_address:
             # no email(s) provided.  Nothing to do.
@@ -30,8 +45,9 @@ class TokenAuthorizationManager(TokenManager, CommonManager):
                 # no valid emails
                 return None
 
-            kwargs['email_address__in'] = email_address
+            email_addresses = email_address
         else:
+            email_addresses = None
             kwargs['email_address'] = email_address
 
         # try setting the reason default if one exists (in the case of proxy
@@ -44,8 +60,27 @@ class TokenAuthorizationManager(TokenManager, CommonManager):
             # a user regardless of the reason.
             del kwargs['reason']
 
-        self.filter(**kwargs).update(expires=datetime(1970, 1, 1))
+        if email_addresses is None:
+            self.filter(**kwargs).update(expires=datetime(1970, 1, 1))
+            return
+
+        for chunk in iter_chunks(email_addresses, self.email_chunk_size):
+            self.filter(email_address__in=chunk,
+                        **kwargs).update(expires=datetime(1970, 1, 1))
 
     def expire_by_emails(self, email_addresses, **kwargs):
         """Expires tokens by a list of email addresses."""
         self.expire_by_email(email_address=email_addresses, **kwargs)
+
+    def delete_expired(self, batch_size=None, sleep=0, progress=None,
+                       **kwargs):
+        """Deletes expired tokens in batches.  See delete_in_batches.
+
+        :param kwargs: additional filter criteria for the tokens to delete.
+        :return: the number of tokens deleted.
+        """
+        return self.delete_in_batches(batch_size=batch_size,
+                                      sleep=sleep,
+                                      progress=progress,
+                                      expires__lte=datetime.utcnow(),
+                                      **kwargs)
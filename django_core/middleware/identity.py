@@ -0,0 +1,25 @@
+from __future__ import unicode_literals
+
+from django_core.db.models.identity import activate_identity_map
+from django_core.db.models.identity import deactivate_identity_map
+
+
+class IdentityMapMiddleware(object):
+    """Middleware that activates a request scoped identity map.  For the
+    duration of a request, repeated primary key lookups through the
+    CommonManager (get_by_id, get_or_none(id=...), etc) return the instance
+    that was already loaded instead of querying the db again.  Instances are
+    removed from the identity map when they're saved or deleted.
+
+    Note: QuerySet.update(...) and QuerySet.delete() don't go through the
+    model instances so they won't clear the identity map.
+    """
+    def process_request(self, request):
+        activate_identity_map()
+
+    def process_response(self, request, response):
+        deactivate_identity_map()
+        return response
+
+    def process_exception(self, request, exception):
+        deactivate_identity_map()
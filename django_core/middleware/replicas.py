@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+
+import time
+
+from django_core.db.pinning import get_pinned_until
+from django_core.db.pinning import set_pinned_until
+from django_core.db.pinning import unpin_from_primary
+from django_core.utils.loading import get_setting
+
+
+class ReplicaPinningMiddleware(object):
+    """Middleware that carries the pin to the primary db (see
+    django_core.db.pinning and ReplicaRouter) across requests.  When a
+    request writes to the db, a cookie is set with the time the pin expires
+    so the user's following requests also read from the primary db and see
+    their own writes, even if they're handled by a different thread or
+    process.
+
+    The cookie name can be changed with the REPLICA_PIN_COOKIE_NAME setting.
+    """
+
+    def get_cookie_name(self):
+        return get_setting('REPLICA_PIN_COOKIE_NAME',
+                           default='django_core_pinned_until')
+
+    def process_request(self, request):
+        unpin_from_primary()
+        pinned_until = request.COOKIES.get(self.get_cookie_name())
+
+        if not pinned_until:
+            return
+
+        try:
+            pinned_until = float(pinned_until)
+        except ValueError:
+            return
+
+        if pinned_until > time.time():
+            set_pinned_until(pinned_until)
+
+    def process_response(self, request, response):
+        pinned_until = get_pinned_until()
+        unpin_from_primary()
+        cookie_name = self.get_cookie_name()
+
+        if pinned_until is None:
+            return response
+
+        seconds = pinned_until - time.time()
+
+        if seconds <= 0:
+            return response
+
+        if request.COOKIES.get(cookie_name) != repr(pinned_until):
+            response.set_cookie(cookie_name,
+                                repr(pinned_until),
+                                max_age=int(seconds) + 1,
+                                httponly=True)
+
+        return response
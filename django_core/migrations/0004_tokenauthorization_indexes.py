@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_core', '0003_auto_20150504_2227'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='tokenauthorization',
+            index_together=set([('email_address', 'reason', 'expires'),
+                                ('user', 'reason')]),
+        ),
+    ]
@@ -57,8 +57,20 @@ class TokenAuthorization(AbstractTokenModel, AbstractBaseModel):
     default_token_duration_days = 7
     reason_default = None
     token_length = 50
+    # with 50 character tokens collisions are so unlikely that it's cheaper to
+    # rely on the unique constraint than to check the db for every token.
+    precheck_tokens = False
     objects = TokenAuthorizationManager()
 
+    class Meta:
+        # (email_address, reason, expires) serves expire_by_email and valid
+        # token lookups by email and (user, reason) serves lookups of a user's
+        # tokens.
+        index_together = (
+            ('email_address', 'reason', 'expires'),
+            ('user', 'reason'),
+        )
+
     def __str__(self, *args, **kwargs):
         return str(self.id)
 
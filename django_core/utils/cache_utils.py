@@ -0,0 +1,69 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LocalTTLCache(object):
+    """Thread safe, process local cache where each value expires timeout
+    seconds after it was set.  Values are stored as is (they aren't pickled
+    like django's local memory cache backend does) so the same object is
+    returned on every get and must not be changed by callers.
+
+    :param timeout: the number of seconds a value is cached for.
+    :param max_size: the max number of values to cache.  When full, the
+        values that were set first are removed.
+    """
+
+    def __init__(self, timeout=300, max_size=10000):
+        self.timeout = timeout
+        self.max_size = max_size
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys):
+        """Gets a dict of {key: value} for the keys that are cached and
+        haven't expired.
+        """
+        now = time.time()
+        found = {}
+
+        with self._lock:
+            for key in keys:
+                item = self._values.get(key)
+
+                if item is None:
+                    continue
+
+                if item[0] <= now:
+                    del self._values[key]
+                    continue
+
+                found[key] = item[1]
+
+        return found
+
+    def set(self, key, value):
+        with self._lock:
+            self._values.pop(key, None)
+
+            while len(self._values) >= self.max_size:
+                self._values.popitem(last=False)
+
+            self._values[key] = (time.time() + self.timeout, value)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
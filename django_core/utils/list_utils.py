@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+from itertools import islice
+
 
 def make_obj_list(obj_or_objs):
     """This method will take an object or list of objects and ensure a list is
@@ -22,3 +24,30 @@ def make_obj_list(obj_or_objs):
         return [obj_or_objs]
 
     return obj_or_objs
+
+
+def iter_chunks(iterable, chunk_size):
+    """Lazily splits any iterable into lists of at most chunk_size items.
+    This never holds more than a single chunk in memory so it's safe to use
+    with generators of arbitrary size.
+
+    Example:
+
+    >>> list(iter_chunks([1, 2, 3, 4, 5], 2))
+    [[1, 2], [3, 4], [5]]
+    >>> list(iter_chunks([], 2))
+    []
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be a positive integer.')
+
+    iterator = iter(iterable)
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+
+        if not chunk:
+            return
+
+        yield chunk
@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 
-import random
+import os
 from random import randint
 
 
@@ -26,6 +26,9 @@ def random_alphanum(length=10, lower_only=False):
         used.
     :return: alphanumeric string size of length
 
+    The value is generated from os.urandom (a cryptographically secure random
+    source). To get many values at once, use random_alphanums(...).
+
     This function uses all number except for:
 
     * 0
@@ -87,15 +90,56 @@ def random_alphanum(length=10, lower_only=False):
         ...
 
     """
-    character_set = ALPHANUM_LOWER if lower_only else ALPHANUM
-    sample_size = 5
-    chars = random.sample(character_set, sample_size)
+    return random_alphanums(count=1, length=length, lower_only=lower_only)[0]
+
+
+def random_alphanums(count=10, length=10, lower_only=False):
+    """Gets a list of random alphanumeric values.  This is much faster than
+    calling random_alphanum(...) count times since all the random bytes are
+    read from the os at once.
+
+    The values are generated from os.urandom (a cryptographically secure
+    random source) and every character in the character set is equally likely
+    to be used for each position.  See random_alphanum(...) for the characters
+    that are used.
 
-    while len(chars) < length:
-        chars += random.sample(character_set, sample_size)
+    :param count: the number of values to return.
+    :param length: size of each random alphanumeric string.
+    :param lower_only: boolean indicating if only lower case letters should be
+        used.
+    :return: list of alphanumeric strings size of length
+    """
+    if count <= 0:
+        return []
 
-    random.shuffle(chars)
-    return ''.join(chars[:length])
+    if length <= 0:
+        return [''] * count
+
+    character_set = ALPHANUM_LOWER if lower_only else ALPHANUM
+    chars = _get_random_chars(character_set=character_set,
+                              count=count * length)
+    return [''.join(chars[i:i + length])
+            for i in range(0, count * length, length)]
+
+
+def _get_random_chars(character_set, count):
+    """Gets a list of count random characters from the character set."""
+    set_size = len(character_set)
+    # Only bytes below the largest multiple of the character set size are
+    # used.  Otherwise the characters at the start of the set would be more
+    # likely to be picked (modulo bias).
+    byte_limit = 256 - (256 % set_size)
+    chars = []
+
+    while len(chars) < count:
+        needed = count - len(chars)
+        # read enough extra bytes to cover the ones that get thrown away
+        num_bytes = needed * 256 // byte_limit + 16
+        chars.extend(character_set[b % set_size]
+                     for b in bytearray(os.urandom(num_bytes))
+                     if b < byte_limit)
+
+    return chars[:count]
 
 
 def generate_key(low=7, high=10, lower_only=False):
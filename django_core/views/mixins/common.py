@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+from django_core.db.models.identity import set_identity
 
 class CommonSingleObjectViewMixin(object):
 
@@ -8,10 +9,14 @@ class CommonSingleObjectViewMixin(object):
         attribute has been set for a view.  In this case, just return the
         object if it has already been set when it's called down the road since
         there's no need to make another query.
+
+        The object is added to the identity map (if one is active) so later
+        lookups by id in the same request don't query the db again.
         """
         if hasattr(self, 'object') and self.object:
             return self.object
 
         obj = super(CommonSingleObjectViewMixin, self).get_object(**kwargs)
+        set_identity(obj)
         self.object = obj
         return obj
@@ -25,11 +25,20 @@ class GenericObjectViewMixin(object):
 
         content_model = self.generic_object_content_type.model_class()
 
+        manager = content_model._default_manager
+
         try:
-            self.content_object = content_model.objects.get(id=object_id)
+            if hasattr(manager, 'get_by_id'):
+                # goes through the identity map if one is active
+                self.content_object = manager.get_by_id(id=object_id)
+            else:
+                self.content_object = manager.get(id=object_id)
         except:
             raise Http404
 
+        if self.content_object is None:
+            raise Http404
+
         return super(GenericObjectViewMixin, self).dispatch(*args,
                                                                 **kwargs)
 
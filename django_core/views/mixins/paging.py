@@ -1,13 +1,61 @@
+from __future__ import unicode_literals
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError
+from django.http.response import Http404
+from django_core.db.models.paging import get_cached_count
+from django_core.db.models.paging import get_count_free_page
+from django_core.db.models.paging import get_estimated_count
+from django_core.db.models.paging import get_keyset_page
+
+
+# errors raised by get_keyset_page for an invalid cursor or ordering
+_KEYSET_PAGE_ERRORS = (AttributeError, FieldDoesNotExist, ValidationError,
+                      ValueError)
+PAGING_MODE_OFFSET = 'offset'
+PAGING_MODE_CURSOR = 'cursor'
+PAGING_MODE_NO_COUNT = 'no_count'
+PAGING_TOTAL_CACHED = 'cached'
+PAGING_TOTAL_ESTIMATED = 'estimated'
 
 
 class PagingViewMixin(object):
-    """View mixin for views that deal with paging."""
+    """View mixin for views that deal with paging.
+
+    Paging modes (paging_mode):
+
+    * "offset" (default): pages are numbered and fetched with an OFFSET.
+    * "cursor": pages are fetched with keyset (seek) pagination (see
+        django_core.db.models.paging) so deep pages cost the same as the first
+        page.  The context gets opaque "next_cursor" and "previous_cursor"
+        values which are passed back through the "cursor_kwarg" query string
+        param.  The queryset's ordering (or the model's default ordering) is
+        used and all ordering fields must be in the same direction.
+    * "no_count": pages are numbered and fetched with an OFFSET, but the
+        total number of objects is never counted.  One more object than the
+        page size is fetched to know if there's a next page.  To show an
+        approximate total, set paging_total to:
+
+        * "cached": the COUNT is cached for paging_total_cache_timeout
+            seconds.
+        * "estimated": on postgresql the planner's row estimate is used for
+            unfiltered querysets.  Otherwise, this falls back to "cached".
+
+        The total is added to the context as "total_count".
+    """
     page_num = 1
     page_size = 15
     page_offset = 0
     paginate_by = page_size
     page_kwarg = 'p'
     page_size_kwarg = 'ps'
+    paging_mode = PAGING_MODE_OFFSET
+    cursor_kwarg = 'c'
+    next_cursor = None
+    previous_cursor = None
+    paging_total = None
+    paging_total_cache_timeout = 300
+    total_count = None
     _original_page_size = page_size
     _original_paginate_by = paginate_by
 
@@ -33,8 +81,77 @@ class PagingViewMixin(object):
         context['page_num'] = self.page_num
         context['page_offset'] = self.page_offset
         context['page_kwarg'] = self.page_kwarg
+
+        if self.paging_mode == PAGING_MODE_CURSOR:
+            context['cursor_kwarg'] = self.cursor_kwarg
+            context['next_cursor'] = self.next_cursor
+            context['previous_cursor'] = self.previous_cursor
+        elif self.paging_mode == PAGING_MODE_NO_COUNT:
+            context['total_count'] = self.total_count
+
         return context
 
+    def paginate_queryset(self, queryset, page_size):
+        """Paginates the queryset according to the paging mode.
+
+        :returns: tuple of (paginator, page, object_list, is_paginated).  In
+            "cursor" mode, there's no paginator and the page is a KeysetPage.
+        """
+        if self.paging_mode == PAGING_MODE_NO_COUNT:
+            return self.paginate_queryset_no_count(queryset, page_size)
+
+        if self.paging_mode != PAGING_MODE_CURSOR:
+            return super(PagingViewMixin, self).paginate_queryset(queryset,
+                                                                  page_size)
+
+        cursor = self.request.GET.get(self.cursor_kwarg or 'c')
+
+        try:
+            page = get_keyset_page(query_set=queryset,
+                                   cursor=cursor,
+                                   size=page_size)
+        except _KEYSET_PAGE_ERRORS:
+            if not cursor:
+                # the ordering can't be paged with cursors
+                raise Http404
+
+            # invalid cursor, fallback to the first page
+            try:
+                page = get_keyset_page(query_set=queryset, size=page_size)
+            except _KEYSET_PAGE_ERRORS:
+                raise Http404
+
+        self.next_cursor = page.next_cursor
+        self.previous_cursor = page.previous_cursor
+        is_paginated = bool(page.next_cursor or page.previous_cursor)
+        return (None, page, page.object_list, is_paginated)
+
+    def paginate_queryset_no_count(self, queryset, page_size):
+        """Paginates the queryset without counting the total number of
+        objects.  The page is a CountFreePage.  Like offset paging, a page
+        past the end raises a 404 (as does an empty first page when the view
+        doesn't allow empty lists).
+        """
+        page = get_count_free_page(query_set=queryset,
+                                   page_num=self.page_num,
+                                   size=page_size)
+        if not page.object_list and (page.number > 1 or
+                                     not self.get_allow_empty()):
+            raise Http404
+
+        if self.paging_total == PAGING_TOTAL_ESTIMATED:
+            self.total_count = get_estimated_count(
+                query_set=queryset,
+                timeout=self.paging_total_cache_timeout
+            )
+        elif self.paging_total == PAGING_TOTAL_CACHED:
+            self.total_count = get_cached_count(
+                query_set=queryset,
+                timeout=self.paging_total_cache_timeout
+            )
+
+        return (None, page, page.object_list, page.has_other_pages())
+
     def get_paging(self):
         """Gets the paging values passed through the query string params.
 
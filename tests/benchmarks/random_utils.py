@@ -0,0 +1,53 @@
+"""Benchmark for generating random tokens.
+
+Compares django_core.utils.random_utils against the previous implementation
+which built values from repeated random.sample(...) calls.
+
+From the root of the repository, run:
+
+    python -m tests.benchmarks.random_utils
+"""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import timeit
+
+from django_core.utils.random_utils import ALPHANUM
+from django_core.utils.random_utils import random_alphanum
+from django_core.utils.random_utils import random_alphanums
+
+
+def sample_random_alphanum(length=10):
+    """The previous random_alphanum implementation."""
+    sample_size = 5
+    chars = random.sample(ALPHANUM, sample_size)
+
+    while len(chars) < length:
+        chars += random.sample(ALPHANUM, sample_size)
+
+    random.shuffle(chars)
+    return ''.join(chars[:length])
+
+
+def run(count=1000, length=50, repeat=5):
+    benchmarks = (
+        ('random.sample (previous)',
+         lambda: [sample_random_alphanum(length) for i in range(count)]),
+        ('random_alphanum',
+         lambda: [random_alphanum(length) for i in range(count)]),
+        ('random_alphanums',
+         lambda: random_alphanums(count=count, length=length)),
+    )
+
+    print('{0} tokens of length {1} (best of {2}):'.format(count, length,
+                                                          repeat))
+
+    for name, func in benchmarks:
+        seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+        print('  {0:<26} {1:8.2f} ms'.format(name, seconds * 1000))
+
+
+if __name__ == '__main__':
+    run(length=15)
+    run(length=50)
@@ -0,0 +1,34 @@
+from __future__ import unicode_literals
+
+from django.views.generic.detail import DetailView
+from django_core.db.models.identity import identity_map
+from django_core.utils.random_utils import random_alphanum
+from django_core.views import CommonSingleObjectViewMixin
+from django_testing.testcases.users import SingleUserTestCase
+
+from test_objects.models import TestModel
+
+
+class TestModelDetailView(CommonSingleObjectViewMixin, DetailView):
+    model = TestModel
+
+
+class CommonSingleObjectViewMixinTests(SingleUserTestCase):
+    """Test case for the common single object view mixin."""
+
+    def test_get_object_identity_map(self):
+        """Test the object is added to the identity map so a later lookup by
+        id doesn't query the db again.
+        """
+        test_model = TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        view = TestModelDetailView(kwargs={'pk': test_model.id})
+
+        with identity_map():
+            with self.assertNumQueries(1):
+                obj = view.get_object()
+                self.assertIs(view.get_object(), obj)
+                self.assertIs(TestModel.objects.get_by_id(obj.pk), obj)
@@ -1,7 +1,9 @@
 from __future__ import unicode_literals
 
+from django.contrib.auth.models import Group
 from django.contrib.contenttypes.models import ContentType
 from django.test import TestCase
+from django_core.utils.random_utils import random_alphanum
 from django_testing.user_utils import create_user
 
 from test_objects.models import GenericObject
@@ -42,3 +44,87 @@ class GenericObjectModelTests(TestCase):
         self.assertEqual(generic_object.content_type,
                          ContentType.objects.get_for_model(self.user))
         self.assertEqual(generic_object.content_object, self.user)
+
+    def test_filter_generic_many(self):
+        """Test filtering by many generic objects with a single query."""
+        user = create_user()
+        group = Group.objects.create(name=random_alphanum())
+        user_objs = [GenericObject.objects.create(content_object=self.user)
+                     for i in range(2)]
+        group_obj = GenericObject.objects.create(content_object=group)
+        GenericObject.objects.create(content_object=user)
+
+        with self.assertNumQueries(1):
+            objs = list(GenericObject.objects.filter_generic_many(
+                content_objects=[self.user, group]
+            ))
+
+        self.assertEqual(set(objs), set(user_objs + [group_obj]))
+
+    def test_filter_generic_many_group_by_object(self):
+        """Test filtering by many generic objects grouped by object."""
+        user = create_user()
+        group = Group.objects.create(name=random_alphanum())
+        user_objs = [GenericObject.objects.create(content_object=self.user)
+                     for i in range(2)]
+        group_obj = GenericObject.objects.create(content_object=group)
+
+        groups = GenericObject.objects.filter_generic_many(
+            content_objects=[group, user, self.user],
+            group_by_object=True
+        )
+
+        self.assertEqual(list(groups.keys()), [group, user, self.user])
+        self.assertEqual(groups[group], [group_obj])
+        self.assertEqual(groups[user], [])
+        self.assertEqual(set(groups[self.user]), set(user_objs))
+
+    def test_with_content_objects(self):
+        """Test resolving the content objects with a query per content
+        type.
+        """
+        users = [create_user() for i in range(3)]
+        groups = [Group.objects.create(name=random_alphanum())
+                  for i in range(2)]
+        deleted_group = Group.objects.create(name=random_alphanum())
+        content_objects = users + groups + [deleted_group]
+        objs = [GenericObject.objects.create(content_object=content_object)
+                for content_object in content_objects]
+        ids = [obj.id for obj in objs]
+        deleted_group.delete()
+
+        # 1 query for the generic objects and 1 query per content type
+        with self.assertNumQueries(3):
+            objs_db = list(GenericObject.objects.with_content_objects().filter(
+                id__in=ids
+            ).order_by('id'))
+            self.assertEqual([obj.content_object for obj in objs_db],
+                             users + groups + [None])
+
+    def test_bulk_get_or_create_generic(self):
+        """Test getting or creating generic objects for many objects."""
+        users = [create_user() for i in range(3)]
+        group = Group.objects.create(name=random_alphanum())
+        existing_obj = GenericObject.objects.create(content_object=users[1])
+
+        results = GenericObject.objects.bulk_get_or_create_generic(
+            content_objects=[users[0], users[1], group, users[0]]
+        )
+
+        self.assertEqual([is_created for obj, is_created in results],
+                         [True, False, True, False])
+        self.assertEqual(results[1][0], existing_obj)
+        self.assertEqual(results[0][0], results[3][0])
+
+        for (obj, is_created), content_object in zip(results, [users[0],
+                                                               users[1],
+                                                               group]):
+            self.assertIsNotNone(obj.id)
+            self.assertEqual(obj.content_object, content_object)
+
+        with self.assertNumQueries(1):
+            results = GenericObject.objects.bulk_get_or_create_generic(
+                content_objects=[users[0], users[1], group]
+            )
+
+        self.assertFalse(any(is_created for obj, is_created in results))
@@ -1,14 +1,24 @@
 from __future__ import unicode_literals
 
+from django.core.cache import caches
+from django.db.backends.sqlite3.base import SQLiteCursorWrapper
+from django.db.models.query import QuerySet
+from django.db.models.deletion import Collector
 from django.http.response import Http404
 from django.utils.text import slugify
+from django_core.db.models.identity import identity_map
 from django_core.utils.random_utils import ALPHANUM
 from django_core.utils.random_utils import random_alphanum
 from django_testing.testcases.users import SingleUserTestCase
 from django_testing.user_utils import create_user
+from mock import patch
 
+from test_objects.models import TestCachedModel
 from test_objects.models import TestManagerModel
+from test_objects.models import TestManyToManyRelationModel
 from test_objects.models import TestModel
+from test_objects.models import TestReadOnlyModel
+from test_objects.models import TestUniqueSlugModel
 
 
 class CommonManagerTests(SingleUserTestCase):
@@ -25,6 +35,62 @@ class CommonManagerTests(SingleUserTestCase):
 
         self.assertIsNone(TestModel.objects.get_or_none(id=1234567890))
 
+    def test_get_or_none_only_defer(self):
+        """Test getting an object with only some of the fields loaded."""
+        test_model = TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        test_model_db = TestModel.objects.get_or_none(
+            only=['id', 'some_unique_field'],
+            id=test_model.id
+        )
+        self.assertEqual(test_model_db, test_model)
+        self.assertIn('some_unique_field_default',
+                      test_model_db.get_deferred_fields())
+        self.assertNotIn('some_unique_field',
+                         test_model_db.get_deferred_fields())
+
+        test_model_db = TestModel.objects.get_or_none(
+            defer=['some_unique_field'],
+            id=test_model.id
+        )
+        self.assertEqual(test_model_db.get_deferred_fields(),
+                         set(['some_unique_field']))
+
+    def test_get_or_none_values(self):
+        """Test getting a row as a dict or namedtuple."""
+        test_model = TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        row = TestModel.objects.get_or_none(values=True,
+                                            only=['id', 'some_unique_field'],
+                                            id=test_model.id)
+        self.assertEqual(row, {'id': test_model.id,
+                               'some_unique_field': test_model.some_unique_field})
+
+        row = TestModel.objects.get_or_none(values=True,
+                                            defer=['some_unique_field'],
+                                            id=test_model.id)
+        self.assertNotIn('some_unique_field', row)
+        self.assertEqual(row['created_user_id'], self.user.id)
+
+        row = TestModel.objects.get_or_none(values=True,
+                                            named=True,
+                                            only=['id', 'some_unique_field'],
+                                            id=test_model.id)
+        self.assertEqual(row.id, test_model.id)
+        self.assertEqual(row.some_unique_field, test_model.some_unique_field)
+
+        self.assertIsNone(TestModel.objects.get_or_none(values=True,
+                                                        id=1234567890))
+        self.assertIsNone(TestModel.objects.get_or_none(values=True,
+                                                        named=True,
+                                                        id=1234567890))
+
     def test_get_by_id(self):
         """Test getting an object by id."""
         test_model = TestModel.objects.create(
@@ -96,6 +162,63 @@ class CommonManagerTests(SingleUserTestCase):
         next_slug = TestManagerModel.objects.get_next_slug(slug=slug)
         self.assertEqual(next_slug, '{0}-1'.format(slug))
 
+    def test_get_next_slug_single_query(self):
+        """Test getting the next available slug fills the first gap in the
+        used "-n" suffixes with a single query.
+        """
+        slug = slugify(random_alphanum())
+
+        for value in (slug, '{0}-1'.format(slug), '{0}-3'.format(slug),
+                      '{0}ing'.format(slug)):
+            TestManagerModel.objects.create(created_user=self.user,
+                                            slug=value)
+
+        with self.assertNumQueries(1):
+            next_slug = TestManagerModel.objects.get_next_slug(slug=slug)
+
+        self.assertEqual(next_slug, '{0}-2'.format(slug))
+
+    def test_create_with_next_slug_retry(self):
+        """Test creating an object with the next slug retries when the slug is
+        taken by a concurrent insert.
+        """
+        slug = slugify(random_alphanum())
+        TestUniqueSlugModel.objects.create(created_user=self.user, slug=slug)
+        taken_slugs = TestUniqueSlugModel.objects._get_taken_slugs([slug])
+
+        # the first lookup misses the slug inserted "concurrently" above so
+        # the first create hits the unique constraint.
+        with patch.object(TestUniqueSlugModel.objects, '_get_taken_slugs',
+                          side_effect=[set(), taken_slugs]) as mock_taken:
+            obj = TestUniqueSlugModel.objects.create_with_next_slug(
+                slug=slug,
+                created_user=self.user
+            )
+
+        self.assertEqual(mock_taken.call_count, 2)
+        self.assertEqual(obj.slug, '{0}-1'.format(slug))
+        self.assertEqual(TestUniqueSlugModel.objects.filter(
+            slug__startswith=slug
+        ).count(), 2)
+
+    def test_get_next_slugs(self):
+        """Test getting the next available slugs for a batch of values."""
+        slug = slugify(random_alphanum())
+        TestManagerModel.objects.create(created_user=self.user, slug=slug)
+        TestManagerModel.objects.create(created_user=self.user,
+                                        slug='{0}-2'.format(slug))
+
+        with self.assertNumQueries(1):
+            slugs = TestManagerModel.objects.get_next_slugs(
+                values=[slug, slug.upper(), 'hello world', 'Hello World', slug]
+            )
+
+        self.assertEqual(slugs, ['{0}-1'.format(slug),
+                                 '{0}-3'.format(slug),
+                                 'hello-world',
+                                 'hello-world-1',
+                                 '{0}-4'.format(slug)])
+
     def test_get_next_token(self):
         """Test for getting the next avaible token."""
         used_tokens = [c for c in list(ALPHANUM) if c != '8']
@@ -118,3 +241,477 @@ class CommonManagerTests(SingleUserTestCase):
         self.assertTrue('8' in tokens)
         self.assertTrue('a' in tokens)
         self.assertTrue('m' in tokens)
+
+    def test_get_by_ids_map(self):
+        """Test getting objects by ids as a dict chunked across queries."""
+        objs = [TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        ) for i in range(5)]
+        ids = [obj.id for obj in objs] + [1234567890]
+
+        with self.assertNumQueries(3):
+            id_map = TestModel.objects.get_by_ids_map(ids=ids, chunk_size=2)
+
+        self.assertEqual(set(id_map.keys()), set(obj.id for obj in objs))
+
+        for obj in objs:
+            self.assertEqual(id_map[obj.id], obj)
+
+    def test_get_by_ids_ordered(self):
+        """Test getting objects by ids in the order the ids were given."""
+        objs = [TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        ) for i in range(3)]
+        ids = [objs[1].id, 1234567890, str(objs[2].id), objs[0].id]
+
+        self.assertEqual(TestModel.objects.get_by_ids_ordered(ids=ids),
+                         [objs[1], objs[2], objs[0]])
+
+    def test_ids_existing_and_missing(self):
+        """Test getting the ids that do and don't exist."""
+        obj = TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        ids = [obj.id, 1234567890]
+
+        self.assertEqual(TestModel.objects.ids_existing(ids=ids), set([obj.id]))
+        self.assertEqual(TestModel.objects.ids_missing(ids=ids),
+                         set([1234567890]))
+
+    def test_get_by_id_identity_map(self):
+        """Test repeated lookups by id return the loaded instance when an
+        identity map is active.
+        """
+        test_model = TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+
+        with identity_map():
+            with self.assertNumQueries(1):
+                obj = TestModel.objects.get_by_id(id=test_model.id)
+                self.assertIs(TestModel.objects.get_by_id(id=test_model.id),
+                              obj)
+                self.assertIs(TestModel.objects.get_or_none(pk=test_model.id),
+                              obj)
+
+            obj.some_int = 10
+            obj.save()
+
+            obj_db = TestModel.objects.get_by_id(id=test_model.id)
+            self.assertIsNot(obj_db, obj)
+            self.assertEqual(obj_db.some_int, 10)
+
+        with self.assertNumQueries(1):
+            TestModel.objects.get_by_id(id=test_model.id)
+
+    def test_bulk_create_iter(self):
+        """Test bulk creating objects from a generator in chunks."""
+        prefix = random_alphanum(5)
+        objs = (TestModel(created_user=self.user,
+                          some_string_no_default='  {0}  '.format(prefix),
+                          some_unique_field='{0}{1}'.format(prefix, i),
+                          some_unique_field_default='{0}{1}'.format(prefix, i))
+                for i in range(5))
+
+        with self.assertNumQueries(3):
+            count = TestModel.objects.bulk_create_iter(objs, batch_size=2)
+
+        self.assertEqual(count, 5)
+        objs_db = TestModel.objects.filter(some_string_no_default=prefix)
+        self.assertEqual(objs_db.count(), 5)
+
+    def test_bulk_update(self):
+        """Test updating many objects with batched statements."""
+        objs = [TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        ) for i in range(5)]
+        user = create_user()
+        last_modified_dttm = objs[0].last_modified_dttm
+
+        for i, obj in enumerate(objs):
+            obj.some_int = i
+            obj.some_string_no_default = ' hello {0} '.format(i)
+            obj.created_user = user
+
+        with self.assertNumQueries(3):
+            rows = TestModel.objects.bulk_update(
+                objs,
+                fields=['some_int', 'some_string_no_default',
+                        'created_user'],
+                batch_size=2
+            )
+
+        self.assertEqual(rows, 5)
+
+        for i, obj in enumerate(objs):
+            obj_db = TestModel.objects.get(id=obj.id)
+            self.assertEqual(obj_db.some_int, i)
+            self.assertEqual(obj_db.some_string_no_default,
+                             'hello {0}'.format(i))
+            self.assertEqual(obj_db.created_user, user)
+            self.assertTrue(obj_db.last_modified_dttm > last_modified_dttm)
+
+    def test_bulk_update_max_query_params(self):
+        """Test each update statement stays under sqlite's limit of 999 bound
+        parameters.
+        """
+        prefix = random_alphanum(5)
+        TestModel.objects.bulk_create([
+            TestModel(created_user=self.user,
+                      some_string_no_default=prefix,
+                      some_unique_field='{0}{1}'.format(prefix, i),
+                      some_unique_field_default='{0}{1}'.format(prefix, i))
+            for i in range(250)
+        ])
+        objs = list(TestModel.objects.filter(some_string_no_default=prefix))
+
+        for i, obj in enumerate(objs):
+            obj.some_int = i
+
+        with patch.object(SQLiteCursorWrapper, 'execute', autospec=True,
+                          side_effect=SQLiteCursorWrapper.execute
+                          ) as mock_execute:
+            rows = TestModel.objects.bulk_update(
+                objs,
+                fields=['some_int', 'some_string_no_default', 'created_user']
+            )
+
+        self.assertEqual(rows, 250)
+        # 4 fields (including last_modified_dttm) bind 9 params per object so
+        # 111 objects fit in each statement.
+        params = [call[0][2] for call in mock_execute.call_args_list
+                  if call[0][1].startswith('UPDATE')]
+        self.assertEqual(len(params), 3)
+
+        for query_params in params:
+            self.assertLessEqual(len(query_params), 999)
+
+        some_ints = dict(TestModel.objects.filter(
+            some_string_no_default=prefix
+        ).values_list('id', 'some_int'))
+        self.assertEqual(some_ints,
+                         dict((obj.id, i) for i, obj in enumerate(objs)))
+
+    def test_bulk_upsert(self):
+        """Test inserting new objects and updating existing objects."""
+        existing = TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        objs = [
+            TestModel(created_user=self.user,
+                      some_int=100,
+                      some_unique_field=existing.some_unique_field,
+                      some_unique_field_default=random_alphanum()),
+            TestModel(created_user=self.user,
+                      some_int=200,
+                      some_unique_field=random_alphanum(),
+                      some_unique_field_default=random_alphanum())
+        ]
+
+        created, updated = TestModel.objects.bulk_upsert(
+            objs,
+            unique_fields=['some_unique_field'],
+            update_fields=['some_int']
+        )
+
+        self.assertEqual(created, [objs[1]])
+        self.assertEqual(updated, [objs[0]])
+        self.assertEqual(objs[0].id, existing.id)
+        self.assertEqual(objs[0].created_dttm, existing.created_dttm)
+
+        existing_db = TestModel.objects.get(id=existing.id)
+        self.assertEqual(existing_db.some_int, 100)
+        self.assertEqual(existing_db.some_unique_field_default,
+                         existing.some_unique_field_default)
+        self.assertEqual(TestModel.objects.get(
+            some_unique_field=objs[1].some_unique_field
+        ).some_int, 200)
+
+    def test_bulk_upsert_none_unique_value(self):
+        """Test objects with a None unique value are always inserted."""
+        existing = TestModel.objects.create(
+            created_user=self.user,
+            some_int=5,
+            some_unique_field=random_alphanum(),
+            some_unique_field_blank=None,
+            some_unique_field_default=random_alphanum()
+        )
+        objs = [TestModel(created_user=self.user,
+                          some_int=100,
+                          some_unique_field=random_alphanum(),
+                          some_unique_field_blank=None,
+                          some_unique_field_default=random_alphanum())
+                for i in range(2)]
+
+        created, updated = TestModel.objects.bulk_upsert(
+            objs,
+            unique_fields=['some_unique_field_blank'],
+            update_fields=['some_int']
+        )
+
+        self.assertEqual(created, objs)
+        self.assertEqual(updated, [])
+        self.assertEqual(TestModel.objects.get(id=existing.id).some_int, 5)
+        self.assertEqual(TestModel.objects.filter(
+            some_unique_field__in=[obj.some_unique_field for obj in objs]
+        ).count(), 2)
+
+    def test_bulk_delete_by_ids(self):
+        """Test deleting objects by ids in chunks without the deletion
+        collector.
+        """
+        objs = [TestManagerModel.objects.create(created_user=self.user)
+                for i in range(5)]
+        ids = [obj.id for obj in objs] + [1234567890]
+
+        with patch.object(Collector, 'collect') as mock_collect:
+            counts = TestManagerModel.objects.bulk_delete_by_ids(ids=ids,
+                                                                 chunk_size=2)
+
+        self.assertEqual(counts, [2, 2, 1])
+        self.assertFalse(mock_collect.called)
+        self.assertFalse(TestManagerModel.objects.filter(id__in=ids).exists())
+
+    def test_bulk_delete_by_ids_cascade(self):
+        """Test deleting objects by ids that have relations that cascade."""
+        objs = [TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        ) for i in range(3)]
+        relation_obj = TestManyToManyRelationModel.objects.create(
+            created_user=self.user
+        )
+        relation_obj.m2m_field.add(*objs)
+        ids = [obj.id for obj in objs]
+
+        counts = TestModel.objects.bulk_delete_by_ids(ids=ids, chunk_size=2)
+
+        # number of rows deleted includes the cascaded m2m rows
+        self.assertEqual(counts, [4, 2])
+        self.assertFalse(TestModel.objects.filter(id__in=ids).exists())
+        self.assertEqual(relation_obj.m2m_field.count(), 0)
+
+    def test_delete_in_batches(self):
+        """Test deleting objects matching filter criteria in locked batches."""
+        slug = random_alphanum(10)
+        objs = [TestManagerModel.objects.create(created_user=self.user,
+                                                slug=slug)
+                for i in range(5)]
+        other_obj = TestManagerModel.objects.create(created_user=self.user)
+        totals = []
+
+        with patch.object(QuerySet, 'select_for_update', autospec=True,
+                          side_effect=QuerySet.select_for_update
+                          ) as mock_select_for_update:
+            total = TestManagerModel.objects.delete_in_batches(
+                batch_size=2,
+                progress=totals.append,
+                slug=slug
+            )
+
+        self.assertEqual(total, 5)
+        self.assertEqual(totals, [2, 4, 5])
+        self.assertTrue(mock_select_for_update.called)
+        self.assertFalse(TestManagerModel.objects.filter(
+            id__in=[obj.id for obj in objs]
+        ).exists())
+        self.assertTrue(TestManagerModel.objects.filter(
+            id=other_obj.id
+        ).exists())
+
+    def test_page_after(self):
+        """Test paging through objects with cursors."""
+        prefix = random_alphanum(5)
+        objs = [TestModel.objects.create(
+            created_user=self.user,
+            some_string_no_default=prefix,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        ) for i in range(7)]
+        objs.reverse()
+
+        page1 = TestModel.objects.page_after(size=3,
+                                             some_string_no_default=prefix)
+        self.assertEqual(page1.object_list, objs[:3])
+        self.assertIsNone(page1.previous_cursor)
+
+        page2 = TestModel.objects.page_after(cursor=page1.next_cursor,
+                                             size=3,
+                                             some_string_no_default=prefix)
+        self.assertEqual(page2.object_list, objs[3:6])
+
+        page3 = TestModel.objects.page_after(cursor=page2.next_cursor,
+                                             size=3,
+                                             some_string_no_default=prefix)
+        self.assertEqual(page3.object_list, objs[6:])
+        self.assertIsNone(page3.next_cursor)
+
+        page2_prev = TestModel.objects.page_after(
+            cursor=page3.previous_cursor,
+            size=3,
+            some_string_no_default=prefix
+        )
+        self.assertEqual(page2_prev.object_list, objs[3:6])
+
+        page1_prev = TestModel.objects.page_after(
+            cursor=page2_prev.previous_cursor,
+            size=3,
+            some_string_no_default=prefix
+        )
+        self.assertEqual(page1_prev.object_list, objs[:3])
+        self.assertIsNone(page1_prev.previous_cursor)
+
+    def test_page_after_ordering(self):
+        """Test paging through objects with cursors by a non unique field."""
+        prefix = random_alphanum(5)
+        objs = [TestModel.objects.create(
+            created_user=self.user,
+            some_int=i % 2,
+            some_string_no_default=prefix,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        ) for i in range(5)]
+        objs.sort(key=lambda obj: (obj.some_int, obj.id))
+        page = TestModel.objects.page_after(size=2, ordering=['some_int'],
+                                            some_string_no_default=prefix)
+        paged_objs = list(page.object_list)
+
+        while page.next_cursor:
+            page = TestModel.objects.page_after(cursor=page.next_cursor,
+                                                size=2,
+                                                ordering=['some_int'],
+                                                some_string_no_default=prefix)
+            paged_objs += page.object_list
+
+        self.assertEqual(paged_objs, objs)
+
+    def test_page_after_nullable_ordering(self):
+        """Test paging with cursors by a nullable field isn't allowed."""
+        with self.assertRaises(ValueError):
+            TestModel.objects.page_after(size=2,
+                                         ordering=['some_unique_field_blank'])
+
+
+class CachedManagerTests(SingleUserTestCase):
+    """Test case for managers that cache lookups."""
+
+    def setUp(self):
+        super(CachedManagerTests, self).setUp()
+        caches['default'].clear()
+
+    def test_get_by_id_cached(self):
+        """Test getting an object by id is served from the cache."""
+        obj = TestCachedModel.objects.create(created_user=self.user)
+
+        with self.assertNumQueries(1):
+            TestCachedModel.objects.get_by_id(id=obj.id)
+
+        with self.assertNumQueries(0):
+            obj_cached = TestCachedModel.objects.get_by_id(id=obj.id)
+
+        self.assertEqual(obj_cached, obj)
+
+    def test_get_by_id_cached_save(self):
+        """Test saving an object updates the cached version."""
+        obj = TestCachedModel.objects.create(created_user=self.user)
+        TestCachedModel.objects.get_by_id(id=obj.id)
+
+        obj.some_int = 10
+        obj.save()
+
+        obj_cached = TestCachedModel.objects.get_by_id(id=obj.id)
+        self.assertEqual(obj_cached.some_int, 10)
+
+    def test_get_by_id_cached_delete(self):
+        """Test deleting an object removes it from the cache."""
+        obj = TestCachedModel.objects.create(created_user=self.user)
+        obj_id = obj.id
+        TestCachedModel.objects.get_by_id(id=obj_id)
+        obj.delete()
+
+        self.assertIsNone(TestCachedModel.objects.get_by_id(id=obj_id))
+
+        with self.assertRaises(Http404):
+            TestCachedModel.objects.get_by_id_or_404(id=obj_id)
+
+    def test_get_by_ids_cached(self):
+        """Test getting objects by ids uses the cache for cached objects."""
+        objs = [TestCachedModel.objects.create(created_user=self.user)
+                for i in range(3)]
+        TestCachedModel.objects.get_by_id(id=objs[0].id)
+        ids = [objs[2].id, objs[0].id, objs[1].id]
+
+        with self.assertNumQueries(1):
+            self.assertEqual(TestCachedModel.objects.get_by_ids_cached(ids=ids),
+                             [objs[2], objs[0], objs[1]])
+
+        with self.assertNumQueries(0):
+            TestCachedModel.objects.get_by_ids_cached(ids=ids)
+
+        self.assertEqual(
+            list(TestCachedModel.objects.get_by_ids(ids=ids).order_by('id')),
+            [objs[0], objs[1], objs[2]]
+        )
+
+
+class ReadOnlyManagerTests(SingleUserTestCase):
+
+    def setUp(self):
+        super(ReadOnlyManagerTests, self).setUp()
+        TestReadOnlyModel.objects.cache_clear()
+        TestReadOnlyModel.objects.bulk_create([
+            TestReadOnlyModel(name=random_alphanum()) for i in range(3)
+        ])
+        self.objs = list(TestReadOnlyModel.objects.order_by('id'))
+
+    def test_get_by_id_local_cache(self):
+        """Test primary key lookups are cached in process."""
+        obj = self.objs[0]
+
+        with self.assertNumQueries(1):
+            obj_db = TestReadOnlyModel.objects.get_by_id(obj.id)
+
+        with self.assertNumQueries(0):
+            self.assertIs(TestReadOnlyModel.objects.get_by_id(obj.id), obj_db)
+
+        self.assertEqual(obj_db, obj)
+        self.assertEqual(obj_db.name, obj.name)
+
+    def test_get_by_ids_local_cache(self):
+        """Test getting many objects by ids only queries for the objects that
+        aren't cached.
+        """
+        TestReadOnlyModel.objects.get_by_id(self.objs[0].id)
+        ids = [obj.id for obj in self.objs]
+
+        with self.assertNumQueries(1):
+            self.assertEqual(TestReadOnlyModel.objects.get_by_ids_cached(ids),
+                             self.objs)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(TestReadOnlyModel.objects.get_by_ids_cached(ids),
+                             self.objs)
+
+    def test_local_cache_filtered_lookup(self):
+        """Test lookups with additional filters aren't cached."""
+        obj = self.objs[0]
+        TestReadOnlyModel.objects.get_by_id(obj.id)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(TestReadOnlyModel.objects.get_by_id(
+                obj.id,
+                name='not the name'
+            ))
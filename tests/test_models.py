@@ -1,14 +1,29 @@
 from __future__ import unicode_literals
 
 from datetime import datetime
+from datetime import timedelta
 from random import randint
 
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from django.test.utils import CaptureQueriesContext
+from django.utils.six import StringIO
+from django_core.db.migrations import AddPartialIndex
+from django_core.db.models.sweepers import ExpiredSweeper
+from django_core.db.models.sweepers import sweep_expired
 from django_core.models import TokenAuthorization
 from django_core.utils.random_utils import random_alphanum
 from django_testing.testcases.users import SingleUserTestCase
+from mock import patch
 
+from test_objects.models import TestDirtyFieldsModel
+from test_objects.models import TestExpiresCustomManagerModel
+from test_objects.models import TestExpiresModel
+from test_objects.models import TestManagerModel
 from test_objects.models import TestManyToManyRelationModel
 from test_objects.models import TestModel
+from test_objects.models import TestSafeDeleteModel
 
 
 class TestTokenAuthorization(TokenAuthorization):
@@ -22,6 +37,145 @@ class TestTokenAuthorization(TokenAuthorization):
 
 class ModelTests(SingleUserTestCase):
 
+    def test_text_field_attnames(self):
+        """Test the text fields plan is computed once for the model."""
+        self.assertEqual(set(TestModel.get_text_field_attnames()), set([
+            'some_string_w_default',
+            'some_string_no_default',
+            'some_unique_field',
+            'some_unique_field_blank',
+            'some_unique_field_default'
+        ]))
+        self.assertIs(TestModel.get_text_field_attnames(),
+                      TestModel.get_text_field_attnames())
+        self.assertEqual(TestManagerModel.get_text_field_attnames(),
+                         ('token', 'slug'))
+
+    def test_save_prep_strips_fields(self):
+        """Test text fields are stripped when prepping many objects."""
+        objs = [TestModel(created_user=self.user,
+                          some_string_no_default='  hello {0} '.format(num),
+                          some_unique_field='world',
+                          some_unique_field_blank=None)
+                for num in range(3)]
+        TestModel.save_prep(objs)
+
+        self.assertEqual([obj.some_string_no_default for obj in objs],
+                         ['hello 0', 'hello 1', 'hello 2'])
+        self.assertEqual([obj.some_unique_field for obj in objs],
+                         ['world'] * 3)
+        self.assertEqual([obj.some_unique_field_blank for obj in objs],
+                         [None] * 3)
+
+    def test_save_prep_calls_strip_fields(self):
+        """Test prepping objects strips each object through strip_fields so
+        models can override it.
+        """
+        objs = [TestModel(created_user=self.user) for num in range(3)]
+
+        with patch.object(TestModel, 'strip_fields',
+                          autospec=True) as mock_strip_fields:
+            TestModel.save_prep(objs)
+
+        self.assertEqual([call[0][0] for call in
+                          mock_strip_fields.call_args_list], objs)
+
+    def test_save_prep_skips_deferred_fields(self):
+        """Test prepping an object doesn't load its deferred fields."""
+        test_model = TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        test_model = TestModel.objects.defer('some_string_no_default').get(
+            id=test_model.id
+        )
+
+        TestModel.save_prep(test_model)
+        self.assertIn('some_string_no_default',
+                      test_model.get_deferred_fields())
+
+    def test_save_dirty_fields(self):
+        """Test only the changed fields are saved when tracking dirty
+        fields.
+        """
+        obj = TestDirtyFieldsModel.objects.create(created_user=self.user,
+                                                  some_text='hello world')
+        obj = TestDirtyFieldsModel.objects.get(id=obj.id)
+        self.assertEqual(obj.get_dirty_fields(), [])
+
+        obj.some_int = 10
+        self.assertEqual(obj.get_dirty_fields(), ['some_int'])
+
+        with CaptureQueriesContext(connection) as queries:
+            obj.save()
+
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"some_int"', queries[0]['sql'])
+        self.assertIn('"last_modified_dttm"', queries[0]['sql'])
+        self.assertNotIn('"some_text"', queries[0]['sql'])
+        self.assertEqual(obj.get_dirty_fields(), [])
+        self.assertEqual(TestDirtyFieldsModel.objects.get(id=obj.id).some_int,
+                         10)
+
+    def test_save_no_dirty_fields(self):
+        """Test nothing is saved when no fields changed."""
+        obj = TestDirtyFieldsModel.objects.create(created_user=self.user)
+        last_modified_dttm = obj.last_modified_dttm
+
+        with self.assertNumQueries(0):
+            obj.save()
+
+        self.assertEqual(obj.last_modified_dttm, last_modified_dttm)
+
+        obj = TestDirtyFieldsModel.objects.get(id=obj.id)
+
+        with self.assertNumQueries(0):
+            obj.save()
+
+    def test_save_dirty_fields_mutable_value(self):
+        """Test changing a mutable value in place makes the field dirty."""
+        obj = TestDirtyFieldsModel.objects.create(created_user=self.user,
+                                                  some_list=['a', 'b'])
+        obj = TestDirtyFieldsModel.objects.get(id=obj.id)
+        obj.some_list.append('c')
+        self.assertEqual(obj.get_dirty_fields(), ['some_list'])
+        obj.save()
+
+        self.assertEqual(TestDirtyFieldsModel.objects.get(id=obj.id).some_list,
+                         ['a', 'b', 'c'])
+
+    def test_save_dirty_fields_after_refresh(self):
+        """Test refreshing from the db takes a new snapshot so a value
+        changed back to the old loaded value is still saved.
+        """
+        obj = TestDirtyFieldsModel.objects.create(created_user=self.user,
+                                                  some_int=5)
+        obj = TestDirtyFieldsModel.objects.get(id=obj.id)
+        TestDirtyFieldsModel.objects.filter(id=obj.id).update(some_int=50)
+
+        obj.refresh_from_db()
+        self.assertEqual(obj.some_int, 50)
+        obj.some_int = 5
+        obj.save()
+
+        self.assertEqual(TestDirtyFieldsModel.objects.get(id=obj.id).some_int,
+                         5)
+
+    def test_save_dirty_fields_deleted_row(self):
+        """Test saving a tracked object whose row was deleted inserts it
+        again.
+        """
+        obj = TestDirtyFieldsModel.objects.create(created_user=self.user)
+        obj = TestDirtyFieldsModel.objects.get(id=obj.id)
+        TestDirtyFieldsModel.objects.filter(id=obj.id).delete()
+
+        obj.some_int = 10
+        obj.save()
+
+        self.assertEqual(TestDirtyFieldsModel.objects.get(id=obj.id).some_int,
+                         10)
+
     def test_copy1(self):
         test_model = TestModel.objects.create(
             created_user=self.user,
@@ -43,6 +197,64 @@ class ModelTests(SingleUserTestCase):
         self.assertEqual(test_model_copy.some_unique_field_default,
                          'Hello world')
 
+    def test_copy_is_field_level(self):
+        """Test excluding fields from a copy doesn't change the list of fields
+        passed in and doesn't share mutable values.
+        """
+        test_model = TestModel.objects.create(
+            created_user=self.user,
+            some_string_no_default='hello',
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        exclude_fields = ['some_string_w_default']
+
+        test_model_copy = test_model.copy(exclude_fields=exclude_fields)
+
+        self.assertEqual(exclude_fields, ['some_string_w_default'])
+        self.assertEqual(test_model_copy.some_string_w_default, 'hello')
+        self.assertEqual(test_model_copy.some_string_no_default, 'hello')
+        self.assertTrue(test_model_copy._state.adding)
+
+        obj = TestDirtyFieldsModel.objects.create(created_user=self.user,
+                                                  some_list=['a'])
+        obj_copy = obj.copy()
+        obj_copy.some_list.append('b')
+        self.assertEqual(obj.some_list, ['a'])
+        obj_copy.save()
+        self.assertIsNotNone(obj_copy.id)
+        self.assertNotEqual(obj_copy.id, obj.id)
+
+    def test_copy_many(self):
+        """Test making many copies of an object to bulk create."""
+        test_model = TestModel.objects.create(
+            created_user=self.user,
+            some_string_no_default='hello',
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+        unique_values = [random_alphanum() for i in range(3)]
+
+        copies = test_model.copy_many(
+            [{'some_unique_field': value, 'some_unique_field_default': value}
+             for value in unique_values],
+            some_int=77
+        )
+        TestModel.objects.bulk_create(copies)
+
+        objs = TestModel.objects.filter(some_unique_field__in=unique_values)
+        self.assertEqual(len(objs), 3)
+
+        for obj in objs:
+            self.assertEqual(obj.some_int, 77)
+            self.assertEqual(obj.some_string_no_default, 'hello')
+            self.assertEqual(obj.created_user, self.user)
+
+        copies = test_model.copy_many(2)
+        self.assertEqual(len(copies), 2)
+        self.assertIsNot(copies[0], copies[1])
+        self.assertIsNone(copies[0].some_unique_field)
+
     def test_copy_override_fields(self):
         """Test overriding fields with the model's .copy method."""
         test_model = TestModel.objects.create(
@@ -125,6 +337,44 @@ class ModelTests(SingleUserTestCase):
 class TokenAuthorizationTests(SingleUserTestCase):
     """Test case for the token authorization model."""
 
+    def test_save_token_collision_retry(self):
+        """Test saving with a generated token that's already taken retries with
+        a new token.
+        """
+        token = random_alphanum(50)
+        TokenAuthorization.objects.create(token=token, created_user=self.user)
+        new_token = random_alphanum(50)
+
+        with patch.object(TokenAuthorization, 'generate_token',
+                          side_effect=[token, new_token]):
+            auth = TokenAuthorization.objects.create(created_user=self.user)
+
+        self.assertEqual(auth.token, new_token)
+        self.assertIsNotNone(auth.id)
+
+    def test_bulk_create_token_collision_retry(self):
+        """Test bulk creating with generated tokens that are already taken only
+        regenerates the tokens that collided.
+        """
+        token = random_alphanum(50)
+        TokenAuthorization.objects.create(token=token, created_user=self.user)
+        tokens = [random_alphanum(50) for i in range(3)]
+        auths = [TokenAuthorization(created_user=self.user,
+                                    expires=datetime.utcnow())
+                 for i in range(3)]
+
+        with patch.object(TokenAuthorization, 'generate_token',
+                          side_effect=[tokens[0], token, tokens[1],
+                                       tokens[2]]):
+            TokenAuthorization.objects.bulk_create(auths)
+
+        self.assertEqual([auth.token for auth in auths],
+                         [tokens[0], tokens[2], tokens[1]])
+        self.assertEqual(
+            TokenAuthorization.objects.filter(token__in=tokens).count(),
+            3
+        )
+
     def test_expire_by_email(self):
         """Test expiring tokens by an email address."""
         email_address = 'testing@example{0}.com'.format(random_alphanum(5))
@@ -235,3 +485,361 @@ class TokenAuthorizationTests(SingleUserTestCase):
 
         for auth in token_auths:
             self.assertTrue(auth.is_expired())
+
+    def test_expire_by_emails_chunked(self):
+        """Test expiring tokens for more email addresses than fit in a single
+        query.
+        """
+        reason = 'BECAUSE_I_AM_TESTING_{0}'.format(random_alphanum(5))
+        email_addresses = ['testing@example{0}{1}.com'.format(
+                               num, random_alphanum(5))
+                           for num in range(5)]
+
+        for email_address in email_addresses:
+            TokenAuthorization.objects.create(email_address=email_address,
+                                              reason=reason,
+                                              created_user=self.user)
+
+        with patch.object(TokenAuthorization.objects, 'email_chunk_size', 2):
+            with self.assertNumQueries(3):
+                TokenAuthorization.objects.expire_by_emails(
+                    email_addresses=email_addresses,
+                    reason=reason
+                )
+
+        token_auths = TokenAuthorization.objects.filter(reason=reason)
+        self.assertEqual(len(token_auths), 5)
+
+        for auth in token_auths:
+            self.assertTrue(auth.is_expired())
+
+    def test_delete_expired(self):
+        """Test deleting expired tokens in batches."""
+        reason = 'BECAUSE_I_AM_TESTING_{0}'.format(random_alphanum(5))
+        expired = [TokenAuthorization.objects.create(
+                       reason=reason,
+                       created_user=self.user,
+                       expires=datetime.utcnow() - timedelta(days=1))
+                   for num in range(5)]
+        valid = TokenAuthorization.objects.create(reason=reason,
+                                                  created_user=self.user)
+        totals = []
+
+        deleted = TokenAuthorization.objects.delete_expired(
+            batch_size=2,
+            progress=totals.append,
+            reason=reason
+        )
+
+        self.assertEqual(deleted, len(expired))
+        self.assertEqual(totals, [2, 4, 5])
+        self.assertEqual(
+            list(TokenAuthorization.objects.filter(reason=reason)),
+            [valid]
+        )
+
+    def test_purge_expired_tokens_command(self):
+        """Test the management command that purges expired tokens."""
+        reason = 'BECAUSE_I_AM_TESTING_{0}'.format(random_alphanum(5))
+
+        for num in range(3):
+            TokenAuthorization.objects.create(
+                reason=reason,
+                created_user=self.user,
+                expires=datetime.utcnow() - timedelta(days=1)
+            )
+
+        out = StringIO()
+        call_command('purge_expired_tokens', batch_size=2, reason=reason,
+                     stdout=out)
+
+        self.assertFalse(TokenAuthorization.objects.filter(
+            reason=reason
+        ).exists())
+        self.assertIn('Deleted 3 expired tokens.', out.getvalue())
+
+    def test_get_valid_by_token(self):
+        """Test getting a token authorization that hasn't expired."""
+        auth = TokenAuthorization.objects.create(created_user=self.user)
+        expired_auth = TokenAuthorization.objects.create(
+            created_user=self.user,
+            expires=datetime.utcnow() - timedelta(days=1)
+        )
+
+        self.assertEqual(TokenAuthorization.objects.get_valid_by_token(
+            token=auth.token
+        ), auth)
+        self.assertIsNone(TokenAuthorization.objects.get_valid_by_token(
+            token=expired_auth.token
+        ))
+
+    def _get_index_names(self, columns):
+        """Gets the names of the indexes on exactly the columns."""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                TokenAuthorization._meta.db_table
+            )
+
+        return [name for name, info in constraints.items()
+                if info['index'] and info['columns'] == columns]
+
+    def _get_query_plan(self, query_set):
+        """Gets the sqlite query plan for the queryset."""
+        sql, params = query_set.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN {0}'.format(sql), params)
+            return ' '.join(row[-1] for row in cursor.fetchall())
+
+    def test_token_authorization_indexes(self):
+        """Test the composite indexes are used for the hot lookups."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is sqlite specific.')
+
+        index_names = self._get_index_names(['user_id', 'reason'])
+        self.assertEqual(len(index_names), 1)
+        plan = self._get_query_plan(TokenAuthorization.objects.filter(
+            user=self.user,
+            reason='TEST_REASON'
+        ))
+        self.assertIn(index_names[0], plan)
+
+        index_names = self._get_index_names(['email_address', 'reason',
+                                             'expires'])
+        self.assertEqual(len(index_names), 1)
+        plan = self._get_query_plan(TokenAuthorization.objects.filter(
+            email_address='testing@example.com',
+            reason='TEST_REASON',
+            expires__gt=datetime.utcnow()
+        ))
+        self.assertIn(index_names[0], plan)
+
+
+class SafeDeleteModelTests(SingleUserTestCase):
+    """Test case for models that are safe deleted."""
+
+    def test_default_manager_excludes_deleted(self):
+        """Test the default manager only returns objects that haven't been
+        deleted.
+        """
+        obj = TestSafeDeleteModel.objects.create(created_user=self.user)
+        deleted_obj = TestSafeDeleteModel.objects.create(created_user=self.user)
+        deleted_obj.delete_safe()
+
+        self.assertIs(TestSafeDeleteModel._default_manager,
+                      TestSafeDeleteModel.objects)
+        self.assertEqual(list(TestSafeDeleteModel.objects.all()), [obj])
+        self.assertEqual(list(TestSafeDeleteModel.objects.deleted()),
+                         [deleted_obj])
+        self.assertEqual(
+            set(TestSafeDeleteModel.all_objects.all()),
+            set([obj, deleted_obj])
+        )
+        self.assertIsNone(TestSafeDeleteModel.objects.get_by_id(
+            deleted_obj.id
+        ))
+
+    def test_delete_safe_unsaved(self):
+        """Test safe deleting an unsaved object inserts it as deleted."""
+        obj = TestSafeDeleteModel(created_user=self.user)
+        obj.delete_safe()
+
+        self.assertIsNotNone(obj.id)
+        self.assertTrue(TestSafeDeleteModel.all_objects.get(
+            id=obj.id
+        ).is_deleted)
+
+    def test_delete_safe_not_on_manager(self):
+        """Test the manager doesn't safe delete the whole table."""
+        self.assertFalse(hasattr(TestSafeDeleteModel.objects, 'delete_safe'))
+        self.assertFalse(hasattr(TestSafeDeleteModel.all_objects,
+                                 'delete_safe'))
+
+    def test_delete_safe_queryset(self):
+        """Test safe deleting a queryset with a single UPDATE."""
+        some_int = randint(1000, 100000)
+        objs = [TestSafeDeleteModel.objects.create(created_user=self.user,
+                                                   some_int=some_int)
+                for i in range(3)]
+        other_obj = TestSafeDeleteModel.objects.create(created_user=self.user)
+
+        with self.assertNumQueries(1):
+            count = TestSafeDeleteModel.objects.filter(
+                some_int=some_int
+            ).delete_safe()
+
+        self.assertEqual(count, 3)
+        self.assertEqual(
+            set(TestSafeDeleteModel.all_objects.filter(some_int=some_int,
+                                                       is_deleted=True)),
+            set(objs)
+        )
+        self.assertFalse(TestSafeDeleteModel.all_objects.get(
+            id=other_obj.id
+        ).is_deleted)
+
+    def test_delete_safe_instance(self):
+        """Test safe deleting an instance only updates the deleted flag."""
+        obj = TestSafeDeleteModel.objects.create(created_user=self.user)
+        TestSafeDeleteModel.all_objects.filter(id=obj.id).update(some_int=77)
+
+        with CaptureQueriesContext(connection) as queries:
+            obj.delete_safe()
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"some_int"', queries[0]['sql'])
+        obj = TestSafeDeleteModel.all_objects.get(id=obj.id)
+        self.assertTrue(obj.is_deleted)
+        self.assertEqual(obj.some_int, 77)
+
+    def test_add_partial_index(self):
+        """Test adding a partial index on the live rows."""
+        operation = AddPartialIndex(model_name='testsafedeletemodel',
+                                    name='test_safe_delete_live_idx',
+                                    fields=['some_int'],
+                                    condition={'is_deleted': False})
+        state = ProjectState.from_apps(TestSafeDeleteModel._meta.apps)
+
+        with connection.schema_editor() as schema_editor:
+            operation.database_forwards('test_objects', schema_editor,
+                                        state, state)
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                TestSafeDeleteModel._meta.db_table
+            )
+
+        self.assertIn('test_safe_delete_live_idx', constraints)
+
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT sql FROM sqlite_master WHERE name = %s',
+                               ['test_safe_delete_live_idx'])
+                self.assertIn('WHERE "is_deleted" = 0', cursor.fetchone()[0])
+
+        with connection.schema_editor() as schema_editor:
+            operation.database_backwards('test_objects', schema_editor,
+                                         state, state)
+
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor,
+                TestSafeDeleteModel._meta.db_table
+            )
+
+        self.assertNotIn('test_safe_delete_live_idx', constraints)
+
+
+class ExpiresModelTests(SingleUserTestCase):
+    """Test case for models that expire."""
+
+    def setUp(self):
+        super(ExpiresModelTests, self).setUp()
+        utc_now = datetime.utcnow()
+        TestExpiresModel.archived_ids = []
+        self.active_objs = [
+            TestExpiresModel.objects.create(created_user=self.user),
+            TestExpiresModel.objects.create(
+                created_user=self.user,
+                expires_dttm=utc_now + timedelta(days=1)
+            )
+        ]
+        self.expired_objs = [
+            TestExpiresModel.objects.create(
+                created_user=self.user,
+                expires_dttm=utc_now - timedelta(days=num + 1)
+            )
+            for num in range(3)
+        ]
+
+    def test_active_expired(self):
+        """Test getting the active and expired objects."""
+        self.assertEqual(set(TestExpiresModel.objects.active()),
+                         set(self.active_objs))
+        self.assertEqual(set(TestExpiresModel.objects.expired()),
+                         set(self.expired_objs))
+        self.assertEqual(
+            set(TestExpiresModel.objects.filter(
+                id__in=[obj.id for obj in self.expired_objs[:2]]
+            ).expired()),
+            set(self.expired_objs[:2])
+        )
+
+    def test_expired_uses_index(self):
+        """Test the expired objects are found with an index range scan."""
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN is sqlite specific.')
+
+        sql, params = TestExpiresModel.objects.expired().query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN {0}'.format(sql), params)
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+
+        self.assertIn('USING INDEX', plan)
+        self.assertIn('expires_dttm', plan)
+
+    def test_delete_expired_archive(self):
+        """Test deleting expired objects in batches after archiving them."""
+        deleted = TestExpiresModel.objects.delete_expired(
+            batch_size=2,
+            archive=TestExpiresModel.archive_expired
+        )
+
+        self.assertEqual(deleted, 3)
+        self.assertEqual(sorted(TestExpiresModel.archived_ids),
+                         sorted(obj.id for obj in self.expired_objs))
+        self.assertEqual(set(TestExpiresModel.objects.all()),
+                         set(self.active_objs))
+
+    def test_sweep_expired_command(self):
+        """Test the management command that sweeps expired objects."""
+        out = StringIO()
+        call_command('sweep_expired', 'test_objects.TestExpiresModel',
+                     batch_size=2, stdout=out)
+
+        self.assertIn('Deleted 3 expired test_objects.TestExpiresModel '
+                      'objects.', out.getvalue())
+        self.assertEqual(len(TestExpiresModel.archived_ids), 3)
+        self.assertEqual(set(TestExpiresModel.objects.all()),
+                         set(self.active_objs))
+
+    def test_sweep_expired_custom_manager(self):
+        """Test sweeping a model whose default manager isn't an
+        ExpiresManager.
+        """
+        utc_now = datetime.utcnow()
+        active_obj = TestExpiresCustomManagerModel.objects.create(
+            created_user=self.user,
+            expires_dttm=utc_now + timedelta(days=1)
+        )
+        expired_obj = TestExpiresCustomManagerModel.objects.create(
+            created_user=self.user,
+            expires_dttm=utc_now - timedelta(days=1)
+        )
+
+        deleted = sweep_expired(models=[TestExpiresCustomManagerModel])
+
+        self.assertEqual(deleted, {TestExpiresCustomManagerModel: 1})
+        self.assertIsNone(TestExpiresCustomManagerModel.objects.get_by_id(
+            expired_obj.id
+        ))
+        self.assertIsNotNone(TestExpiresCustomManagerModel.objects.get_by_id(
+            active_obj.id
+        ))
+
+    def test_expired_sweeper(self):
+        """Test the in process sweeper."""
+        sweeper = ExpiredSweeper(models=[TestExpiresModel], batch_size=2)
+        self.assertEqual(sweeper.sweep(), {TestExpiresModel: 3})
+        self.assertFalse(TestExpiresModel.objects.expired().exists())
+
+        with patch('django_core.db.models.sweepers.sweep_expired') as sweep:
+            sweeper = ExpiredSweeper(interval=60)
+            sweeper.start()
+            sweeper.stop(timeout=5)
+
+        self.assertFalse(sweeper.is_alive())
+        self.assertEqual(sweep.call_count, 1)
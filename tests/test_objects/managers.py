@@ -6,3 +6,7 @@ from django_core.db.models import CommonManager
 
 class BaseTestManager(SlugManager, TokenManager, UserManager, CommonManager):
     pass
+
+
+class TestCachedManager(CommonManager):
+    cache_lookups = True
@@ -2,13 +2,17 @@ from __future__ import unicode_literals
 
 from django.conf import settings
 from django.db import models
+from django_core.db.models import AbstractSafeDeleteModelMixin
 from django_core.db.models import AbstractTokenModel
 from django_core.db.models.fields import IntegerListField
 from django_core.db.models.fields import ListField
 from django_core.db.models.mixins.base import AbstractBaseModel
+from django_core.db.models.mixins.crud import ReadOnlyModelMixin
+from django_core.db.models.mixins.dates import AbstractExpiresModelMixin
 from django_core.db.models.mixins.generic import AbstractGenericObject
 
 from test_objects.managers import BaseTestManager
+from test_objects.managers import TestCachedManager
 
 
 list_field_choices = (('TEST', 'Testing'),
@@ -41,6 +45,18 @@ class TestManagerModel(AbstractTokenModel, AbstractBaseModel):
     objects = BaseTestManager()
 
 
+class TestUniqueSlugModel(AbstractBaseModel):
+    """Test model with a unique slug."""
+    slug = models.SlugField(unique=True)
+    objects = BaseTestManager()
+
+
+class TestCachedModel(AbstractBaseModel):
+    """Test model for a model with cached lookups."""
+    some_int = models.IntegerField(default=5)
+    objects = TestCachedManager()
+
+
 class TestListFieldModel(models.Model):
     """Test model for list field."""
     list_field = ListField()
@@ -71,3 +87,38 @@ class GenericObject(AbstractGenericObject):
 class TestManyToManyRelationModel(AbstractBaseModel):
     """Test model for many to many relations."""
     m2m_field = models.ManyToManyField(TestModel)
+
+
+class TestDirtyFieldsModel(AbstractBaseModel):
+    """Test model that only saves the fields that changed."""
+    some_int = models.IntegerField(default=5)
+    some_text = models.TextField(blank=True, null=True)
+    some_list = ListField(blank=True, null=True)
+    track_dirty_fields = True
+
+
+class TestSafeDeleteModel(AbstractSafeDeleteModelMixin, AbstractBaseModel):
+    """Test model for a model that's safe deleted."""
+    some_int = models.IntegerField(default=5)
+
+
+class TestExpiresModel(AbstractExpiresModelMixin, AbstractBaseModel):
+    """Test model for a model that expires."""
+    some_int = models.IntegerField(default=5)
+
+    archived_ids = []
+
+    @classmethod
+    def archive_expired(cls, objs):
+        cls.archived_ids.extend(obj.id for obj in objs)
+
+
+class TestExpiresCustomManagerModel(AbstractExpiresModelMixin,
+                                    AbstractBaseModel):
+    """Test model for a model that expires and has its own manager."""
+    objects = BaseTestManager()
+
+
+class TestReadOnlyModel(ReadOnlyModelMixin, models.Model):
+    """Test model for a read only model."""
+    name = models.CharField(max_length=50)
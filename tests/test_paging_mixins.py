@@ -0,0 +1,140 @@
+from __future__ import unicode_literals
+
+from django.core.cache import caches
+from django.http.response import Http404
+from django.test import RequestFactory
+from django.views.generic.list import ListView
+from django_core.db.models.paging import decode_cursor
+from django_core.db.models.paging import encode_cursor
+from django_core.utils.random_utils import random_alphanum
+from django_core.views import PagingViewMixin
+from django_testing.testcases.users import SingleUserTestCase
+
+from test_objects.models import TestModel
+
+
+class CursorPagingListView(PagingViewMixin, ListView):
+    paging_mode = 'cursor'
+    page_size = 2
+
+    def get_queryset(self):
+        return TestModel.objects.filter(
+            some_string_no_default=self.kwargs['prefix']
+        )
+
+
+class RelatedOrderingPagingListView(CursorPagingListView):
+
+    def get_queryset(self):
+        return super(RelatedOrderingPagingListView, self).get_queryset(
+        ).order_by('created_user__username')
+
+
+class NullableOrderingPagingListView(CursorPagingListView):
+
+    def get_queryset(self):
+        return super(NullableOrderingPagingListView, self).get_queryset(
+        ).order_by('some_unique_field_blank')
+
+
+class NoCountPagingListView(CursorPagingListView):
+    paging_mode = 'no_count'
+
+
+class PagingViewMixinTests(SingleUserTestCase):
+    """Test case for the paging view mixin."""
+
+    def setUp(self):
+        super(PagingViewMixinTests, self).setUp()
+        self.prefix = random_alphanum(5)
+        self.objs = [TestModel.objects.create(
+            created_user=self.user,
+            some_string_no_default=self.prefix,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        ) for i in range(3)]
+        self.objs.reverse()
+
+    def get_context(self, view_class, **params):
+        request = RequestFactory().get('/', params)
+        response = view_class.as_view()(request, prefix=self.prefix)
+        return response.context_data
+
+    def test_cursor_paging(self):
+        """Test paging with cursors."""
+        context = self.get_context(CursorPagingListView)
+        self.assertEqual(list(context['object_list']), self.objs[:2])
+        self.assertIsNone(context['previous_cursor'])
+        self.assertTrue(context['is_paginated'])
+
+        context = self.get_context(CursorPagingListView,
+                                   c=context['next_cursor'])
+        self.assertEqual(list(context['object_list']), self.objs[2:])
+        self.assertIsNone(context['next_cursor'])
+        self.assertIsNotNone(context['previous_cursor'])
+
+    def test_cursor_paging_invalid_cursor(self):
+        """Test an invalid cursor falls back to the first page."""
+        context = self.get_context(CursorPagingListView, c='invalid')
+        self.assertEqual(list(context['object_list']), self.objs[:2])
+
+    def test_cursor_paging_invalid_cursor_values(self):
+        """Test a cursor with values that aren't valid for the ordering fields
+        falls back to the first page.
+        """
+        context = self.get_context(CursorPagingListView)
+        values, reverse = decode_cursor(context['next_cursor'])
+        cursor = encode_cursor(values=['invalid'] * len(values))
+        context = self.get_context(CursorPagingListView, c=cursor)
+        self.assertEqual(list(context['object_list']), self.objs[:2])
+
+    def test_cursor_paging_invalid_ordering(self):
+        """Test an ordering that can't be paged with cursors raises a 404."""
+        with self.assertRaises(Http404):
+            self.get_context(RelatedOrderingPagingListView)
+
+        with self.assertRaises(Http404):
+            self.get_context(RelatedOrderingPagingListView, c='invalid')
+
+        with self.assertRaises(Http404):
+            self.get_context(NullableOrderingPagingListView)
+
+    def test_no_count_paging(self):
+        """Test paging without counting the total number of objects."""
+        with self.assertNumQueries(1):
+            context = self.get_context(NoCountPagingListView)
+
+        self.assertEqual(list(context['object_list']), self.objs[:2])
+        self.assertTrue(context['page_obj'].has_next())
+        self.assertFalse(context['page_obj'].has_previous())
+        self.assertIsNone(context['total_count'])
+
+        context = self.get_context(NoCountPagingListView, p=2)
+        self.assertEqual(list(context['object_list']), self.objs[2:])
+        self.assertFalse(context['page_obj'].has_next())
+        self.assertTrue(context['page_obj'].has_previous())
+
+    def test_no_count_paging_past_the_end(self):
+        """Test a page past the end raises a 404."""
+        with self.assertRaises(Http404):
+            self.get_context(NoCountPagingListView, p=3)
+
+    def test_no_count_paging_cached_total(self):
+        """Test paging without counting with a cached total."""
+        caches['default'].clear()
+        view_class = type(str('CachedTotalListView'), (NoCountPagingListView,),
+                          {'paging_total': 'cached'})
+        context = self.get_context(view_class)
+        self.assertEqual(context['total_count'], 3)
+
+        TestModel.objects.create(
+            created_user=self.user,
+            some_string_no_default=self.prefix,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+
+        with self.assertNumQueries(1):
+            context = self.get_context(view_class)
+
+        self.assertEqual(context['total_count'], 3)
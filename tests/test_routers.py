@@ -0,0 +1,149 @@
+from __future__ import unicode_literals
+
+import time
+
+from django.http.response import HttpResponse
+from django.test.client import RequestFactory
+from django.test.testcases import TestCase
+from django.test.utils import override_settings
+from django_core.db.pinning import get_pinned_until
+from django_core.db.pinning import is_pinned_to_primary
+from django_core.db.pinning import pin_to_primary
+from django_core.db.pinning import unpin_from_primary
+from django_core.db.pinning import use_primary
+from django_core.db.routers import ReadOnlyModelRouter
+from django_core.db.routers import ReplicaRouter
+from django_core.middleware.replicas import ReplicaPinningMiddleware
+from django_core.utils.random_utils import random_alphanum
+from django_testing.testcases.users import SingleUserTestCase
+
+from test_objects.models import TestModel
+from test_objects.models import TestReadOnlyModel
+
+
+class ReadOnlyModelRouterTests(TestCase):
+    """Test case for the read only model router."""
+
+    def setUp(self):
+        super(ReadOnlyModelRouterTests, self).setUp()
+        self.router = ReadOnlyModelRouter()
+
+    @override_settings(READ_ONLY_MODEL_DB_ALIAS='replica')
+    def test_db_for_read(self):
+        """Test reads of read only models go to the replica."""
+        self.assertEqual(self.router.db_for_read(TestReadOnlyModel),
+                         'replica')
+        self.assertIsNone(self.router.db_for_read(TestModel))
+        self.assertIsNone(self.router.db_for_write(TestReadOnlyModel))
+
+    def test_db_for_read_not_configured(self):
+        """Test reads fall through when no replica is configured."""
+        self.assertIsNone(self.router.db_for_read(TestReadOnlyModel))
+
+    def test_allow_relation(self):
+        """Test read only objects can be related to objects in any db."""
+        self.assertTrue(self.router.allow_relation(TestReadOnlyModel(),
+                                                   TestModel()))
+        self.assertIsNone(self.router.allow_relation(TestModel(),
+                                                     TestModel()))
+
+
+@override_settings(REPLICA_DB_ALIASES=['replica1', 'replica2'],
+                   REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTests(SingleUserTestCase):
+    """Test case for the replica router."""
+
+    def setUp(self):
+        super(ReplicaRouterTests, self).setUp()
+        unpin_from_primary()
+        self.router = ReplicaRouter()
+
+    def tearDown(self):
+        unpin_from_primary()
+        super(ReplicaRouterTests, self).tearDown()
+
+    def test_db_for_read(self):
+        """Test reads are load balanced across the replicas."""
+        aliases = set(self.router.db_for_read(TestModel) for i in range(50))
+        self.assertEqual(aliases, set(['replica1', 'replica2']))
+        self.assertEqual(self.router.db_for_write(TestModel), 'default')
+
+    @override_settings(REPLICA_DB_ALIASES=[])
+    def test_db_for_read_no_replicas(self):
+        """Test reads go to the primary when there are no replicas."""
+        self.assertEqual(self.router.db_for_read(TestModel), 'default')
+        pin_to_primary()
+        self.assertIsNone(get_pinned_until())
+
+    def test_pinned_after_save(self):
+        """Test reads are pinned to the primary after a write."""
+        self.assertFalse(is_pinned_to_primary())
+
+        TestModel.objects.create(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )
+
+        self.assertTrue(is_pinned_to_primary())
+        self.assertEqual(self.router.db_for_read(TestModel), 'default')
+        self.assertTrue(get_pinned_until() <= time.time() + 5)
+
+    def test_pinned_after_bulk_create(self):
+        """Test reads are pinned to the primary after a bulk insert."""
+        TestModel.objects.bulk_create([TestModel(
+            created_user=self.user,
+            some_unique_field=random_alphanum(),
+            some_unique_field_default=random_alphanum()
+        )])
+
+        self.assertTrue(is_pinned_to_primary())
+
+    def test_pin_expires(self):
+        """Test the pin expires after the window."""
+        pin_to_primary(seconds=-1)
+        self.assertFalse(is_pinned_to_primary())
+        self.assertIn(self.router.db_for_read(TestModel),
+                      ['replica1', 'replica2'])
+
+    def test_use_primary(self):
+        """Test forcing reads to the primary for a block."""
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(TestModel), 'default')
+
+        self.assertNotEqual(self.router.db_for_read(TestModel), 'default')
+
+    def test_allow_migrate(self):
+        """Test the replicas aren't migrated."""
+        self.assertFalse(self.router.allow_migrate('replica1', 'test_objects'))
+        self.assertIsNone(self.router.allow_migrate('default', 'test_objects'))
+
+    def test_manager_primary(self):
+        """Test the manager can read from the primary."""
+        self.assertEqual(TestModel.objects.primary().db, 'default')
+
+    def test_middleware(self):
+        """Test the pin is carried to the next request with a cookie."""
+        middleware = ReplicaPinningMiddleware()
+        request = RequestFactory().post('/')
+        middleware.process_request(request)
+        pin_to_primary()
+        pinned_until = get_pinned_until()
+        response = middleware.process_response(request, HttpResponse())
+
+        self.assertFalse(is_pinned_to_primary())
+        cookie = response.cookies['django_core_pinned_until']
+        self.assertEqual(float(cookie.value), pinned_until)
+
+        request = RequestFactory().get('/')
+        request.COOKIES['django_core_pinned_until'] = cookie.value
+        middleware.process_request(request)
+        self.assertTrue(is_pinned_to_primary())
+        response = middleware.process_response(request, HttpResponse())
+        self.assertNotIn('django_core_pinned_until', response.cookies)
+        self.assertFalse(is_pinned_to_primary())
+
+        request = RequestFactory().get('/')
+        request.COOKIES['django_core_pinned_until'] = str(time.time() - 1)
+        middleware.process_request(request)
+        self.assertFalse(is_pinned_to_primary())
@@ -0,0 +1,49 @@
+from __future__ import unicode_literals
+
+from django.test.testcases import TestCase
+from django_core.utils.cache_utils import LocalTTLCache
+from mock import patch
+
+
+class LocalTTLCacheTestCase(TestCase):
+    """Test case for the process local cache."""
+
+    def test_get_set(self):
+        """Test setting and getting cached values."""
+        cache = LocalTTLCache()
+        value = object()
+        cache.set('a', value)
+
+        self.assertIs(cache.get('a'), value)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get_many(['a', 'b']), {'a': value})
+
+        cache.delete_many(['a'])
+        self.assertIsNone(cache.get('a'))
+
+    def test_timeout(self):
+        """Test values expire after the timeout."""
+        cache = LocalTTLCache(timeout=10)
+
+        with patch('django_core.utils.cache_utils.time.time',
+                   return_value=100):
+            cache.set('a', 1)
+
+        with patch('django_core.utils.cache_utils.time.time',
+                   return_value=109):
+            self.assertEqual(cache.get('a'), 1)
+
+        with patch('django_core.utils.cache_utils.time.time',
+                   return_value=110):
+            self.assertIsNone(cache.get('a'))
+
+        self.assertEqual(len(cache), 0)
+
+    def test_max_size(self):
+        """Test the values set first are removed when the cache is full."""
+        cache = LocalTTLCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'b': 2, 'c': 3})
@@ -1,7 +1,10 @@
 from __future__ import unicode_literals
 
 from django.test.testcases import TestCase
+from django_core.utils.random_utils import ALPHANUM
+from django_core.utils.random_utils import ALPHANUM_LOWER
 from django_core.utils.random_utils import random_alphanum
+from django_core.utils.random_utils import random_alphanums
 
 
 class RandomUtilsTestCase(TestCase):
@@ -24,3 +27,27 @@ class RandomUtilsTestCase(TestCase):
             if not c.isdigit() and not c.islower():
                 self.fail('Random value has an upper case character: '
                           '{0}'.format(random_val))
+
+    def test_random_alphanums(self):
+        """Test getting many random values at once."""
+        random_vals = random_alphanums(count=100, length=20)
+        self.assertEqual(len(random_vals), 100)
+        self.assertEqual(len(set(random_vals)), 100)
+
+        for random_val in random_vals:
+            self.assertEqual(len(random_val), 20)
+            self.assertTrue(set(random_val).issubset(ALPHANUM))
+
+    def test_random_alphanums_uses_all_characters(self):
+        """Test characters are sampled with replacement from the whole
+        character set.
+        """
+        random_val = ''.join(random_alphanums(count=200, length=50,
+                                              lower_only=True))
+        self.assertEqual(set(random_val), set(ALPHANUM_LOWER))
+
+    def test_random_alphanums_empty(self):
+        """Test zero length and zero count values."""
+        self.assertEqual(random_alphanum(length=0), '')
+        self.assertEqual(random_alphanums(count=3, length=0), ['', '', ''])
+        self.assertEqual(random_alphanums(count=0, length=10), [])